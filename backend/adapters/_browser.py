@@ -0,0 +1,216 @@
+"""
+Shared async Playwright browsers for adapters that drive Chromium on the event loop.
+
+Launching Chromium costs 1-2s per search; instead BROWSER_POOL_SIZE headless
+browsers stay up in a queue. A search checks one out and gets a new page in
+that browser's long-lived BrowserContext, so cookies, the portal's session and
+the HTTP cache carry over between searches. The context is replaced every
+CONTEXT_RECYCLE_AFTER pages (or after a search fails) and the browser every
+BROWSER_POOL_RECYCLE_AFTER pages, to keep memory growth in check; the slot is
+checked out at the time, so no other search is using either.
+The Playwright driver process is started once and outlives browser recycles.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route, async_playwright
+
+BROWSER_POOL_SIZE = 3
+BROWSER_POOL_RECYCLE_AFTER = 100
+CONTEXT_RECYCLE_AFTER = 25
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    # Background subsystems a scraper never uses
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-extensions",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+# Small viewport — less layout/paint work per page
+VIEWPORT = {"width": 1024, "height": 768}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Never needed for parsing — aborted before they hit the wire. Analytics
+# beacons / pings surface as "other" (documents, scripts and XHR are kept).
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media", "other"})
+
+# Third-party analytics / tag hosts — their scripts and XHR are dropped too
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "newrelic.com",
+    "nr-data.net",
+    "siteimproveanalytics.com",
+    "dynatrace.com",
+)
+
+
+@dataclass(slots=True)
+class _PooledBrowser:
+    browser: Browser | None = None
+    context: BrowserContext | None = None
+    uses: int = 0
+    context_uses: int = 0
+
+
+class _BrowserPool:
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        recycle_after: int = BROWSER_POOL_RECYCLE_AFTER,
+    ):
+        self._size = size
+        self._recycle_after = recycle_after
+        self._driver_lock = asyncio.Lock()
+        self._playwright: Playwright | None = None
+        # Idle slots; a slot's browser is launched on first checkout
+        self._idle: asyncio.Queue[_PooledBrowser] = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(_PooledBrowser())
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Yield a new page in a pooled browser's long-lived context, closing the page afterwards."""
+        slot = await self._idle.get()
+        try:
+            if slot.browser is not None and slot.uses >= self._recycle_after:
+                await _close_quietly(slot.browser)
+                slot.browser = None
+            elif slot.context is not None and slot.context_uses >= CONTEXT_RECYCLE_AFTER:
+                await _close_quietly(slot.context)
+                slot.context = None
+            await self._ensure_launched(slot)
+            await self._ensure_context(slot)
+            slot.uses += 1
+            slot.context_uses += 1
+
+            page = await slot.context.new_page()
+            try:
+                yield page
+            except BaseException:
+                # Unknown page/session state (timeout, crash) — start clean next time
+                await _close_quietly(slot.context)
+                slot.context = None
+                raise
+            finally:
+                if not page.is_closed():
+                    await _close_quietly(page)
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def _ensure_launched(self, slot: _PooledBrowser) -> None:
+        if slot.browser is None or not slot.browser.is_connected():
+            pw = await self._driver()
+            slot.browser = await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            slot.context = None  # contexts die with their browser
+            slot.uses = 0
+
+    async def _ensure_context(self, slot: _PooledBrowser) -> None:
+        if slot.context is None:
+            slot.context = await slot.browser.new_context(user_agent=USER_AGENT, viewport=VIEWPORT)
+            await slot.context.route("**/*", block_heavy_resources)
+            slot.context_uses = 0
+
+    async def _driver(self) -> Playwright:
+        async with self._driver_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            return self._playwright
+
+    async def _checkout_all(self) -> list[_PooledBrowser]:
+        # Waits for in-flight searches to hand their browsers back
+        return [await self._idle.get() for _ in range(self._size)]
+
+    async def start(self) -> None:
+        """Start the driver and launch every browser ahead of the first search."""
+        slots = await self._checkout_all()
+        try:
+            # return_exceptions so no launch is still running once the slots go back
+            results = await asyncio.gather(
+                *(self._ensure_launched(slot) for slot in slots), return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        finally:
+            for slot in slots:
+                self._idle.put_nowait(slot)
+
+    async def close(self) -> None:
+        """Close every browser and stop the Playwright driver (called on app shutdown)."""
+        slots = await self._checkout_all()
+        try:
+            for slot in slots:
+                if slot.browser is not None:
+                    await _close_quietly(slot.browser)
+                slot.browser = None
+                slot.context = None
+                slot.uses = 0
+        finally:
+            for slot in slots:
+                self._idle.put_nowait(slot)
+            async with self._driver_lock:
+                if self._playwright is not None:
+                    await self._playwright.stop()
+                self._playwright = None
+
+
+async def _close_quietly(target: Browser | BrowserContext | Page) -> None:
+    try:
+        await target.close()
+    except Exception:
+        pass  # already crashed / disconnected
+
+
+def is_blocked(resource_type: str, url: str) -> bool:
+    """True for requests a scraper never needs: heavy resources and analytics hosts."""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+
+async def block_heavy_resources(route: Route) -> None:
+    """Route handler: abort images/CSS/fonts/media and analytics, let everything else through."""
+    if is_blocked(route.request.resource_type, route.request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+_pool = _BrowserPool()
+
+
+def browser_page():
+    """Shortcut for ``_pool.page()``."""
+    return _pool.page()
+
+
+async def warm_browser() -> None:
+    """Start the shared driver + browsers (called on app startup). Failures are retried on first use."""
+    try:
+        await _pool.start()
+    except Exception as exc:
+        print(f"[browser] warmup failed: {type(exc).__name__}: {exc}")
+
+
+async def close_browser() -> None:
+    await _pool.close()
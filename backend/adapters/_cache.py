@@ -0,0 +1,59 @@
+"""
+Small in-process LRU cache with per-entry TTL.
+
+Used to short-circuit repeat lookups (same name searched again, same file
+number opened twice) without hitting the remote registry. Not shared across
+worker processes — each uvicorn worker keeps its own copy.
+
+get_or_load adds single-flight loading: concurrent misses on the same key share
+one in-flight load instead of each going to the network.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from adapters._concurrency import SingleFlight
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value, or await loader() to fill it. Only successful
+        loads are cached; an exception propagates to every caller waiting on it.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return await self._flight.do(key, lambda: self._load(key, loader))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self.set(key, value)
+        return value
@@ -0,0 +1,53 @@
+"""
+Concurrency limits for outbound registry traffic.
+
+Per-host semaphores keep a burst of searches from opening more connections (or
+browsers) than the upstream tolerates — past that point we only collect 429s.
+gather_bounded caps how many coroutines of a fan-out run at once.
+SingleFlight collapses identical concurrent calls into one.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+OC_SEM = asyncio.Semaphore(8)   # api.opencorporates.com
+CA_SEM = asyncio.Semaphore(4)   # calico.sos.ca.gov
+DE_SEM = asyncio.Semaphore(3)   # matches the Delaware executor's max_workers
+
+
+async def gather_bounded(
+    n: int,
+    *aws: Awaitable[Any],
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """asyncio.gather, with at most n of the awaitables running at once."""
+    semaphore = asyncio.Semaphore(n)
+
+    async def _run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time; callers arriving while it is in
+    flight await the same result (or exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._run(key, fn))
+            self._inflight[key] = fut
+        # shield: one caller being cancelled must not cancel the call for the others
+        return await asyncio.shield(fut)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await fn()
+        finally:
+            self._inflight.pop(key, None)
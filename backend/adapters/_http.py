@@ -0,0 +1,34 @@
+"""
+Shared HTTP client for the REST-based adapters and detail fetchers.
+
+One process-wide httpx.AsyncClient keeps a warm connection pool (HTTP/2 where
+the server supports it), so repeat calls to the same host skip the TCP + TLS
+handshake. Callers pass their own per-request timeout.
+
+Created lazily on first use; closed from the FastAPI lifespan on shutdown.
+"""
+import httpx
+
+DEFAULT_TIMEOUT = 20.0
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
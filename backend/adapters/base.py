@@ -1,8 +1,39 @@
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 
-@dataclass
+from adapters._concurrency import gather_bounded
+
+# Similar-name ranking: keep at most this many names scoring >= the cutoff (0-100)
+SIMILAR_LIMIT = 25
+SIMILAR_SCORE_CUTOFF = 70
+
+_EXTRACTION_SCORES = {"primary": 1.0, "fallback": 0.7, "llm": 0.4, "failed": 0.1}
+_CLARITY_SCORES = {"clear": 1.0, "inferred": 0.7, "ambiguous": 0.4}
+_SOURCE_SCORE = 0.85  # web_form baseline
+
+
+def _confidence(extraction: float, clarity: float) -> float:
+    # Weighted formula from architecture doc
+    return round(extraction * 0.40 + _SOURCE_SCORE * 0.25 + clarity * 0.25 + 1.0 * 0.10, 2)
+
+
+# Every known (extraction_method, result_clarity) pair, scored once at import
+CONFIDENCE_TABLE: dict[tuple[str, str], float] = {
+    (method, clarity): _confidence(m_score, c_score)
+    for method, m_score in _EXTRACTION_SCORES.items()
+    for clarity, c_score in _CLARITY_SCORES.items()
+}
+
+
+def normalize_name(name: str) -> str:
+    """Comparison key for entity names — Unicode-aware caseless match."""
+    return name.strip().casefold()
+
+
+@dataclass(slots=True)
 class EntityMatch:
     """A single entity found on the state's search results page."""
     name: str
@@ -11,8 +42,14 @@ class EntityMatch:
     file_number: str = ""
     registered: str = "" # date string if available
 
+    # normalize_name(name), for exact-match comparisons; derived, not persisted
+    name_key: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name_key = normalize_name(self.name)
+
 
-@dataclass
+@dataclass(slots=True)
 class AdapterResult:
     """Structured output from a state adapter."""
     state_code: str
@@ -37,22 +74,53 @@ class BaseStateAdapter(ABC):
     state_code: str
     state_name: str
 
+    # Subclasses can override with their own precomputed table
+    confidence_table: dict[tuple[str, str], float] = CONFIDENCE_TABLE
+
     @abstractmethod
     async def search(self, name: str, entity_type: str) -> AdapterResult:
         """Run a search on the state's SOS website and return structured results."""
         ...
 
+    @classmethod
+    async def search_many(
+        cls,
+        queries: list[tuple[str, str]],
+        max_concurrency: int = 5,
+    ) -> list[AdapterResult | BaseException]:
+        """
+        Run several (name, entity_type) searches against this state concurrently.
+        Results come back in query order; a search that raised is returned as its exception.
+        """
+        adapter = cls()
+        return await gather_bounded(
+            max_concurrency,
+            *(adapter.search(name, entity_type) for name, entity_type in queries),
+            return_exceptions=True,
+        )
+
     def _build_confidence(
         self,
         extraction_method: str,
         result_clarity: str,  # clear | inferred | ambiguous
     ) -> float:
-        extraction_scores = {"primary": 1.0, "fallback": 0.7, "llm": 0.4, "failed": 0.1}
-        clarity_scores = {"clear": 1.0, "inferred": 0.7, "ambiguous": 0.4}
-
-        extraction = extraction_scores.get(extraction_method, 0.4)
-        clarity = clarity_scores.get(result_clarity, 0.4)
-        source = 0.85  # web_form baseline; subclasses can override
+        score = self.confidence_table.get((extraction_method, result_clarity))
+        if score is None:
+            # Unrecognised label (e.g. free text from the LLM) — score as low-trust
+            score = _confidence(
+                _EXTRACTION_SCORES.get(extraction_method, 0.4),
+                _CLARITY_SCORES.get(result_clarity, 0.4),
+            )
+        return score
 
-        # Weighted formula from architecture doc
-        return round(extraction * 0.40 + source * 0.25 + clarity * 0.25 + 1.0 * 0.10, 2)
+    def _rank_similar(self, search_name: str, names: list[str]) -> list[str]:
+        """Order names by fuzzy closeness to the searched name, dropping weak matches."""
+        ranked = process.extract(
+            search_name,
+            names,
+            scorer=fuzz.WRatio,
+            processor=default_process,
+            limit=SIMILAR_LIMIT,
+            score_cutoff=SIMILAR_SCORE_CUTOFF,
+        )
+        return [name for name, _score, _index in ranked]
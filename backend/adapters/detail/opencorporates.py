@@ -9,11 +9,24 @@ API pattern: https://api.opencorporates.com/v0.4/companies/us_{state_code}/{file
 No authentication required for basic fields (name, type, incorporation date,
 current status). Officers / registered agent requires an API key on paid plans.
 """
+import asyncio
+
 import httpx
+import orjson
+
+from adapters._cache import TTLCache
+from adapters._concurrency import OC_SEM
+from adapters._http import get_client
 
 OC_BASE = "https://api.opencorporates.com/v0.4/companies"
 TIMEOUT = 15.0
 
+# Bodies larger than this (officer-heavy paid-plan responses) are decoded off the event loop
+THREAD_PARSE_BYTES = 16_000
+
+# Successful lookups only — errors are always retried on the next call
+_cache = TTLCache(maxsize=1024, ttl=600)
+
 
 async def fetch_entity_detail(state_code: str, file_number: str) -> dict:
     """
@@ -23,16 +36,30 @@ async def fetch_entity_detail(state_code: str, file_number: str) -> dict:
       entity_name, entity_kind, formation_date, registered_agent,
       opencorporates_url, error (optional)
     """
+    key = (state_code.lower(), file_number)
+    cached = _cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    detail = await _fetch(state_code, file_number)
+    if "error" not in detail:
+        _cache.set(key, detail)
+    return dict(detail)
+
+
+async def _fetch(state_code: str, file_number: str) -> dict:
     jurisdiction = f"us_{state_code.lower()}"
     url = f"{OC_BASE}/{jurisdiction}/{file_number}"
     oc_url = f"https://opencorporates.com/companies/{jurisdiction}/{file_number}"
 
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        client = get_client()
+        async with OC_SEM:
             resp = await client.get(
                 url,
                 headers={"Accept": "application/json"},
                 follow_redirects=True,
+                timeout=TIMEOUT,
             )
 
         if resp.status_code == 404:
@@ -55,16 +82,21 @@ async def fetch_entity_detail(state_code: str, file_number: str) -> dict:
                 "error": f"OpenCorporates returned HTTP {resp.status_code}.",
             }
 
-        data = resp.json()
+        if len(resp.content) > THREAD_PARSE_BYTES:
+            data = await asyncio.to_thread(orjson.loads, resp.content)
+        else:
+            data = orjson.loads(resp.content)
         company = data.get("results", {}).get("company", {})
 
-        # Registered agent: look in officers list for role containing "agent"
-        registered_agent = None
-        for officer in company.get("officers", []):
-            role = (officer.get("officer", {}).get("position") or "").lower()
-            if "agent" in role:
-                registered_agent = officer.get("officer", {}).get("name")
-                break
+        # Registered agent: first officer whose role contains "agent"
+        registered_agent = next(
+            (
+                o.get("officer", {}).get("name")
+                for o in company.get("officers") or ()
+                if "agent" in (o.get("officer", {}).get("position") or "").lower()
+            ),
+            None,
+        )
 
         return {
             "entity_name": company.get("name"),
@@ -14,19 +14,57 @@ Notes:
   - Exact match against a dissolved/cancelled entity is flagged — name may be
     available, but the user should verify with an attorney.
 """
+import asyncio
+
 import httpx
+import ijson
+import orjson
+from ijson.common import ObjectBuilder
 
-from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch
+from adapters._cache import TTLCache
+from adapters._concurrency import CA_SEM
+from adapters._http import get_client
+from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch, normalize_name
 from config import settings
 
 API_URL = "https://calico.sos.ca.gov/cbc/v1/api/BusinessEntityKeywordSearch"
 TIMEOUT = 20.0
 
-# Statuses that indicate the entity is no longer active
-_INACTIVE = {
+# Bodies larger than this are decoded + parsed off the event loop
+THREAD_PARSE_BYTES = 32_000
+# Bodies declared larger than this are stream-parsed, stopping at the first exact match
+STREAM_PARSE_BYTES = 64_000
+
+# Parsed matches keyed by normalised search term; error responses are not cached
+_cache = TTLCache(maxsize=512, ttl=300)
+
+# Statuses that indicate the entity is no longer active (statuses are
+# lower-cased in _parse_results, so membership needs no further normalising)
+_INACTIVE = frozenset({
     "dissolved", "cancelled", "canceled", "forfeited",
     "sos canceled", "sos cancelled", "void",
-}
+})
+
+# ijson prefixes of a result row for each response shape _parse_results accepts
+_ROW_PREFIXES = frozenset({
+    "item", "results.item", "Results.item", "entities.item", "Entities.item",
+})
+
+# Candidate field names per column — CA API field names confirmed at runtime,
+# so both PascalCase and camelCase variants are tried in order.
+_NAME_KEYS = ("EntityName", "entityName", "Name", "name")
+_TYPE_KEYS = ("EntityType", "entityType", "EntityTypeName", "entityTypeName")
+_STATUS_KEYS = (
+    "Status", "status",
+    "StatusType", "statusType",
+    "EntityStatus", "entityStatus",
+)
+_NUMBER_KEYS = ("EntityNumber", "entityNumber", "FileNumber", "fileNumber")
+_DATE_KEYS = (
+    "FormationDate", "formationDate",
+    "RegistrationDate", "registrationDate",
+    "InitialFilingDate", "initialFilingDate",
+)
 
 
 class CaliforniaAdapter(BaseStateAdapter):
@@ -43,18 +81,8 @@ class CaliforniaAdapter(BaseStateAdapter):
                 notes="CA SOS API key not configured. Set the CA_SOS_API_KEY environment variable.",
             )
 
-        name_upper = name.strip().upper()
-        headers = {"Ocp-Apim-Subscription-Key": settings.ca_sos_api_key}
-
         try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                resp = await client.get(
-                    API_URL,
-                    params={"search-term": name_upper},
-                    headers=headers,
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            matches = await self._cached_search(name.strip().upper())
         except httpx.TimeoutException:
             return AdapterResult(
                 state_code=self.state_code,
@@ -87,7 +115,34 @@ class CaliforniaAdapter(BaseStateAdapter):
                 notes=f"CA SOS API error: {type(exc).__name__}: {exc}",
             )
 
-        return self._classify(_parse_results(data), name)
+        return self._classify(matches, name)
+
+    async def _cached_search(self, name_upper: str) -> list[EntityMatch]:
+        """Return parsed matches for the search term, served from cache while fresh."""
+        matches = _cache.get(name_upper)
+        if matches is not None:
+            return matches
+
+        client = get_client()
+        async with CA_SEM:
+            async with client.stream(
+                "GET",
+                API_URL,
+                params={"search-term": name_upper},
+                headers={"Ocp-Apim-Subscription-Key": settings.ca_sos_api_key},
+                timeout=TIMEOUT,
+            ) as resp:
+                resp.raise_for_status()
+                if int(resp.headers.get("content-length") or 0) > STREAM_PARSE_BYTES:
+                    matches = await _stream_results(resp, normalize_name(name_upper))
+                else:
+                    content = await resp.aread()
+                    if len(content) > THREAD_PARSE_BYTES:
+                        matches = await asyncio.to_thread(_decode_results, content)
+                    else:
+                        matches = _decode_results(content)
+        _cache.set(name_upper, matches)
+        return matches
 
     def _classify(self, matches: list[EntityMatch], search_name: str) -> AdapterResult:
         if not matches:
@@ -100,12 +155,14 @@ class CaliforniaAdapter(BaseStateAdapter):
                 source_type="api",
             )
 
-        name_upper = search_name.strip().upper()
-        exact = [m for m in matches if m.name.strip().upper() == name_upper]
-        similar = [m for m in matches if m not in exact]
+        name_key = normalize_name(search_name)
+        exact: list[EntityMatch] = []
+        similar: list[EntityMatch] = []
+        for m in matches:
+            (exact if m.name_key == name_key else similar).append(m)
 
         if exact:
-            all_inactive = all(m.status.lower() in _INACTIVE for m in exact)
+            all_inactive = all(m.status in _INACTIVE for m in exact)
             note = f"Exact match found: '{exact[0].name}' (status: {exact[0].status})."
             if all_inactive:
                 note += (
@@ -117,8 +174,8 @@ class CaliforniaAdapter(BaseStateAdapter):
                 state_name=self.state_name,
                 availability="taken",
                 confidence=self._build_confidence("primary", "clear"),
-                raw_matches=[m.__dict__ for m in exact],
-                similar_names=[m.name for m in similar],
+                raw_matches=exact,
+                similar_names=self._rank_similar(search_name, [m.name for m in similar]),
                 notes=note,
                 source_type="api",
             )
@@ -128,8 +185,8 @@ class CaliforniaAdapter(BaseStateAdapter):
             state_name=self.state_name,
             availability="similar",
             confidence=self._build_confidence("primary", "inferred"),
-            raw_matches=[m.__dict__ for m in matches],
-            similar_names=[m.name for m in matches],
+            raw_matches=list(matches),  # matches may be the cached list — don't share it
+            similar_names=self._rank_similar(search_name, [m.name for m in matches]),
             notes=f"{len(matches)} similar California entity name(s) found. No exact match.",
             source_type="api",
         )
@@ -139,15 +196,70 @@ class CaliforniaAdapter(BaseStateAdapter):
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _get(row: dict, *keys: str, default: str = "") -> str:
-    """Try multiple possible field names — CA API field names confirmed at runtime."""
+def _get(row: dict, keys: tuple[str, ...], default: str = "") -> str:
+    """Return the first non-blank value among the candidate field names."""
     for key in keys:
         val = row.get(key)
-        if val is not None and str(val).strip():
-            return str(val).strip()
+        if val is None:
+            continue
+        val = val.strip() if isinstance(val, str) else str(val).strip()
+        if val:
+            return val
     return default
 
 
+async def _stream_results(resp: httpx.Response, name_key: str) -> list[EntityMatch]:
+    """
+    Incrementally parse a large response body, returning as soon as an exact
+    match is seen. The rest of the body is never read, so similar names listed
+    after the exact match are not collected.
+    """
+    rows: list[dict] = []
+    parser = ijson.parse_coro(_row_collector(rows))
+    matches: list[EntityMatch] = []
+
+    async for chunk in resp.aiter_bytes():
+        parser.send(chunk)
+        for match in _parse_results(rows):
+            matches.append(match)
+            if match.name_key == name_key:
+                return matches
+        rows.clear()
+
+    parser.close()
+    matches.extend(_parse_results(rows))
+    return matches
+
+
+def _row_collector(rows: list[dict]):
+    """
+    ijson push target that appends every complete result row to rows.
+    Accepts the same shapes as _parse_results: a top-level list, or a list
+    under results / Results / entities / Entities.
+    """
+    def collect():
+        builder = None
+        while True:
+            prefix, event, value = yield
+            if builder is None:
+                if event == "start_map" and prefix in _ROW_PREFIXES:
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+            elif event == "end_map" and prefix in _ROW_PREFIXES:
+                rows.append(builder.value)
+                builder = None
+            else:
+                builder.event(event, value)
+
+    target = collect()
+    next(target)  # prime the generator so it can receive events
+    return target
+
+
+def _decode_results(content: bytes) -> list[EntityMatch]:
+    return _parse_results(orjson.loads(content))
+
+
 def _parse_results(data) -> list[EntityMatch]:
     """
     Parse the CA SOS API response.
@@ -171,33 +283,14 @@ def _parse_results(data) -> list[EntityMatch]:
     for row in rows:
         if not isinstance(row, dict):
             continue
-        name = _get(row, "EntityName", "entityName", "Name", "name")
+        name = _get(row, _NAME_KEYS)
         if not name:
             continue
         matches.append(EntityMatch(
             name=name,
-            entity_type=_get(
-                row,
-                "EntityType", "entityType",
-                "EntityTypeName", "entityTypeName",
-            ),
-            status=_get(
-                row,
-                "Status", "status",
-                "StatusType", "statusType",
-                "EntityStatus", "entityStatus",
-                default="unknown",
-            ),
-            file_number=_get(
-                row,
-                "EntityNumber", "entityNumber",
-                "FileNumber", "fileNumber",
-            ),
-            registered=_get(
-                row,
-                "FormationDate", "formationDate",
-                "RegistrationDate", "registrationDate",
-                "InitialFilingDate", "initialFilingDate",
-            ),
+            entity_type=_get(row, _TYPE_KEYS),
+            status=_get(row, _STATUS_KEYS, default="unknown").lower(),
+            file_number=_get(row, _NUMBER_KEYS),
+            registered=_get(row, _DATE_KEYS),
         ))
     return matches
@@ -4,21 +4,86 @@ URL: https://icis.corp.delaware.gov/Ecorp/EntitySearch/NameSearch.aspx
 
 Uses sync_playwright in a ThreadPoolExecutor to avoid asyncio subprocess
 limitations on Windows (SelectorEventLoop does not support subprocess transport).
+
+Each worker thread keeps one Playwright driver + Chromium process alive for its
+lifetime; a search only opens (and closes) a fresh BrowserContext, which is
+cheap and fully isolated (own cookies, storage, cache).
 """
 import asyncio
+import re
 import sys
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
 
 from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
 
-from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch
+from adapters._browser import is_blocked
+from adapters._concurrency import DE_SEM
+from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch, normalize_name
+from llm.client import interpret_state_page
 
 SEARCH_URL = "https://icis.corp.delaware.gov/Ecorp/EntitySearch/NameSearch.aspx"
 NAME_INPUT = "#ctl00_ContentPlaceHolder1_frmEntityName"
 SUBMIT_BUTTON = "input[type='submit']"
 NO_RESULTS_TEXT = ["no entity", "no records", "not found", "0 records", "no results"]
+_NO_RESULTS_RE = re.compile("|".join(map(re.escape, NO_RESULTS_TEXT)), re.IGNORECASE)
+
+# Returns the first two cells of every #tblResults row (null when the table
+# is absent) in a single CDP round trip.
+_ROWS_JS = """() => {
+    const table = document.querySelector('#tblResults');
+    if (!table) return null;
+    return Array.from(table.querySelectorAll('tr'))
+        .map(tr => Array.from(tr.querySelectorAll('td'), td => td.innerText.trim()))
+        .filter(cells => cells.length >= 2)
+        .map(cells => [cells[0], cells[1]]);
+}"""
+
+# Resolves as soon as the postback has rendered either outcome
+_RESULTS_READY_JS = """(phrases) => {
+    if (document.querySelector('#tblResults')) return true;
+    const text = document.body ? document.body.innerText.toLowerCase() : '';
+    return phrases.some(p => text.includes(p));
+}"""
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+EXTRA_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+VIEWPORT = {"width": 1024, "height": 768}
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-extensions",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+MAX_WORKERS = 3
+SEARCH_TIMEOUT = 90  # seconds per search, once a worker is free
+# How often a worker waiting on the LLM checks whether the search was abandoned
+LLM_CANCEL_POLL = 0.5
 
-_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="playwright")
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="playwright")
+
+# Per-worker-thread Playwright state — sync Playwright objects must only ever
+# be touched from the thread that created them.
+_thread_state = threading.local()
+
+
+class _SearchCancelled(Exception):
+    """Raised inside a worker once the awaiting coroutine has given up on the search."""
 
 
 class DelawareAdapter(BaseStateAdapter):
@@ -27,19 +92,35 @@ class DelawareAdapter(BaseStateAdapter):
 
     async def search(self, name: str, entity_type: str) -> AdapterResult:
         """Async entry point — runs the sync Playwright search in a thread."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        # Set when this coroutine stops waiting (timeout, task cancellation) so
+        # the worker abandons the page at its next checkpoint instead of running
+        # to completion and holding a worker slot for nothing.
+        cancel = threading.Event()
         try:
-            return await asyncio.wait_for(
-                loop.run_in_executor(_executor, self._search_sync, name, entity_type),
-                timeout=90,
-            )
+            # Queue here rather than in the executor so time spent waiting for
+            # a free worker doesn't count against the 90s search budget.
+            await DE_SEM.acquire()
+            deadline = time.monotonic() + SEARCH_TIMEOUT
+            try:
+                worker = loop.run_in_executor(
+                    _executor, self._search_sync, name, entity_type, cancel, loop, deadline,
+                )
+            except BaseException:
+                DE_SEM.release()
+                raise
+            # The slot is freed when the worker thread returns, not when this
+            # coroutine stops waiting — otherwise the next search would take it
+            # and then sit in the executor queue behind a still-running page.
+            worker.add_done_callback(_release_worker_slot)
+            return await asyncio.wait_for(asyncio.shield(worker), timeout=SEARCH_TIMEOUT)
         except asyncio.TimeoutError:
             return AdapterResult(
                 state_code=self.state_code,
                 state_name=self.state_name,
                 availability="error",
                 confidence=0.1,
-                notes="Search timed out after 90 seconds.",
+                notes=f"Search timed out after {SEARCH_TIMEOUT} seconds.",
             )
         except Exception as exc:
             return AdapterResult(
@@ -49,50 +130,50 @@ class DelawareAdapter(BaseStateAdapter):
                 confidence=0.1,
                 notes=f"Unexpected error: {type(exc).__name__}: {exc}",
             )
+        finally:
+            cancel.set()
 
     # ------------------------------------------------------------------
     # Everything below is synchronous — runs inside the ThreadPoolExecutor
     # ------------------------------------------------------------------
 
-    def _search_sync(self, name: str, entity_type: str) -> AdapterResult:
-        # sync_playwright creates its own asyncio event loop internally via
-        # asyncio.new_event_loop(). On Windows, the loop type is determined by
-        # the active policy. We must set ProactorEventLoopPolicy here, inside
-        # the worker thread/process, before sync_playwright initialises.
-        if sys.platform == "win32":
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                ],
-            )
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.9",
-                },
-            )
+    def _search_sync(
+        self,
+        name: str,
+        entity_type: str,
+        cancel: threading.Event,
+        loop: asyncio.AbstractEventLoop,
+        deadline: float,
+    ) -> AdapterResult:
+        _raise_if_cancelled(cancel)
+        browser = _get_browser()
+        context = browser.new_context(
+            user_agent=USER_AGENT,
+            extra_http_headers=EXTRA_HEADERS,
+            viewport=VIEWPORT,
+        )
+        # 60s accommodates government server latency.
+        context.set_default_navigation_timeout(60_000)
+        try:
             page = context.new_page()
-            try:
-                # "commit" fires as soon as HTTP response headers arrive — much
-                # earlier than "domcontentloaded", which can stall on slow ASPX
-                # servers. 60s accommodates government server latency.
-                page.goto(SEARCH_URL, wait_until="commit", timeout=60_000)
-                return self._fill_and_extract(page, name, entity_type)
-            finally:
-                browser.close()
-
-    def _fill_and_extract(self, page, name: str, entity_type: str) -> AdapterResult:
+            page.route("**/*", _block_heavy_resources)
+            # With images/CSS/fonts blocked, "domcontentloaded" no longer stalls
+            # on the slow ASPX server the way it did with full resource loading.
+            page.goto(SEARCH_URL, wait_until="domcontentloaded")
+            return self._fill_and_extract(page, name, entity_type, cancel, loop, deadline)
+        finally:
+            context.close()
+
+    def _fill_and_extract(
+        self,
+        page,
+        name: str,
+        entity_type: str,
+        cancel: threading.Event,
+        loop: asyncio.AbstractEventLoop,
+        deadline: float,
+    ) -> AdapterResult:
+        _raise_if_cancelled(cancel)
         try:
             page.wait_for_selector(NAME_INPUT, timeout=10_000)
         except PWTimeout:
@@ -105,74 +186,81 @@ class DelawareAdapter(BaseStateAdapter):
                 extraction_method="failed",
             )
 
+        _raise_if_cancelled(cancel)
         page.fill(NAME_INPUT, name)
         page.click(SUBMIT_BUTTON)
 
         try:
-            page.wait_for_load_state("networkidle", timeout=20_000)
+            page.wait_for_function(_RESULTS_READY_JS, arg=NO_RESULTS_TEXT, timeout=20_000)
         except PWTimeout:
             pass  # parse whatever loaded
 
-        return self._parse_results(page, name, entity_type)
+        _raise_if_cancelled(cancel)
+        return self._parse_results(page, name, entity_type, cancel, loop, deadline)
 
-    def _parse_results(self, page, name: str, entity_type: str) -> AdapterResult:
-        page_text = page.inner_text("body").lower()
+    def _parse_results(
+        self,
+        page,
+        name: str,
+        entity_type: str,
+        cancel: threading.Event,
+        loop: asyncio.AbstractEventLoop,
+        deadline: float,
+    ) -> AdapterResult:
+        rows = page.evaluate(_ROWS_JS)
 
         # Delaware shows #tblResults when there are hits; its absence means no results.
-        has_results_table = page.locator("#tblResults").count() > 0
-
-        if not has_results_table or any(phrase in page_text for phrase in NO_RESULTS_TEXT):
-            return AdapterResult(
-                state_code=self.state_code,
-                state_name=self.state_name,
-                availability="available",
-                confidence=self._build_confidence("primary", "clear"),
-                notes="No matching entities found in Delaware registry.",
-                extraction_method="primary",
-            )
+        if rows is None:
+            return self._no_results()
 
-        matches = self._parse_table_rows(page)
+        matches = self._parse_table_rows(rows)
+        if matches:
+            return self._classify(matches, name, entity_type)
 
-        if not matches:
-            return self._llm_fallback(page_text, name, entity_type)
+        # Table present but nothing parseable — only now pay for the full body text
+        page_text = page.inner_text("body")
+        if _NO_RESULTS_RE.search(page_text):
+            return self._no_results()
+        return self._llm_fallback(page_text, name, entity_type, cancel, loop, deadline)
 
-        return self._classify(matches, name, entity_type)
+    def _no_results(self) -> AdapterResult:
+        return AdapterResult(
+            state_code=self.state_code,
+            state_name=self.state_name,
+            availability="available",
+            confidence=self._build_confidence("primary", "clear"),
+            notes="No matching entities found in Delaware registry.",
+            extraction_method="primary",
+        )
 
-    def _parse_table_rows(self, page) -> list[EntityMatch]:
+    def _parse_table_rows(self, rows: list[list[str]]) -> list[EntityMatch]:
         """
-        Parse Delaware's #tblResults table.
+        Build matches from the #tblResults rows extracted by _ROWS_JS.
         Structure: col 0 = FILE NUMBER, col 1 = ENTITY NAME (link text).
         Row 0 is the header; skip it.
         """
         matches: list[EntityMatch] = []
-        try:
-            rows = page.locator("#tblResults tr").all()
-            for row in rows:
-                cells = row.locator("td").all()
-                if len(cells) < 2:
-                    continue
-                file_number = cells[0].inner_text().strip()
-                entity_name = cells[1].inner_text().strip()
-
-                # Skip the header row
-                if entity_name.upper() == "ENTITY NAME" or file_number.upper() == "FILE NUMBER":
-                    continue
-                if not entity_name:
-                    continue
-
-                matches.append(EntityMatch(
-                    name=entity_name,
-                    entity_type="",   # not returned on the list page
-                    status="unknown",
-                    file_number=file_number,
-                ))
-        except Exception:
-            pass
+        for file_number, entity_name in rows:
+            # Skip the header row
+            if entity_name.upper() == "ENTITY NAME" or file_number.upper() == "FILE NUMBER":
+                continue
+            if not entity_name:
+                continue
+
+            matches.append(EntityMatch(
+                name=entity_name,
+                entity_type="",   # not returned on the list page
+                status="unknown",
+                file_number=file_number,
+            ))
         return matches
 
     def _classify(self, matches: list[EntityMatch], search_name: str, entity_type: str) -> AdapterResult:
-        name_upper = search_name.upper().strip()
-        exact = [m for m in matches if m.name.upper().strip() == name_upper]
+        name_key = normalize_name(search_name)
+        exact: list[EntityMatch] = []
+        similar: list[EntityMatch] = []
+        for m in matches:
+            (exact if m.name_key == name_key else similar).append(m)
 
         if exact:
             return AdapterResult(
@@ -180,32 +268,58 @@ class DelawareAdapter(BaseStateAdapter):
                 state_name=self.state_name,
                 availability="taken",
                 confidence=self._build_confidence("primary", "clear"),
-                raw_matches=[m.__dict__ for m in exact],
-                similar_names=[m.name for m in matches if m not in exact],
+                raw_matches=exact,
+                similar_names=self._rank_similar(search_name, [m.name for m in similar]),
                 notes=f"Exact match found: '{exact[0].name}'",
             )
 
-        similar = [m.name for m in matches]
         return AdapterResult(
             state_code=self.state_code,
             state_name=self.state_name,
             availability="similar",
             confidence=self._build_confidence("primary", "inferred"),
-            raw_matches=[m.__dict__ for m in matches],
-            similar_names=similar,
+            raw_matches=matches,
+            similar_names=self._rank_similar(search_name, [m.name for m in similar]),
             notes=f"{len(similar)} similar name(s) found. No exact match. Review for deceptive similarity.",
         )
 
-    def _llm_fallback(self, page_text: str, name: str, entity_type: str) -> AdapterResult:
-        """Called only when deterministic extraction fails. Uses sync LLM client."""
-        from llm.client import interpret_state_page_sync
-
-        interpretation = interpret_state_page_sync(
-            state_name=self.state_name,
-            search_name=name,
-            entity_type=entity_type,
-            page_text=page_text[:3000],
+    def _llm_fallback(
+        self,
+        page_text: str,
+        name: str,
+        entity_type: str,
+        cancel: threading.Event,
+        loop: asyncio.AbstractEventLoop,
+        deadline: float,
+    ) -> AdapterResult:
+        """
+        Called only when deterministic extraction fails. The LLM call runs on
+        the app's event loop (sharing the async client's connection pool);
+        this worker thread waits for it until the search's deadline, or until
+        the search is abandoned, then cancels it.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            interpret_state_page(
+                state_name=self.state_name,
+                search_name=name,
+                entity_type=entity_type,
+                page_text=page_text,
+            ),
+            loop,
         )
+        interpretation = None
+        while interpretation is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or cancel.is_set():
+                future.cancel()
+                interpretation = {"notes": "LLM fallback did not finish within the search budget."}
+                break
+            try:
+                interpretation = future.result(timeout=min(remaining, LLM_CANCEL_POLL))
+            except FutureTimeout:
+                continue
+            except Exception:
+                interpretation = {"notes": "LLM response could not be parsed."}
 
         return AdapterResult(
             state_code=self.state_code,
@@ -216,3 +330,98 @@ class DelawareAdapter(BaseStateAdapter):
             notes=interpretation.get("notes", "Result interpreted via LLM fallback."),
             extraction_method="llm",
         )
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _release_worker_slot(worker: asyncio.Future) -> None:
+    DE_SEM.release()
+    if not worker.cancelled():
+        worker.exception()  # retrieved: an abandoned search's outcome is expected to go unread
+
+
+def _raise_if_cancelled(cancel: threading.Event) -> None:
+    if cancel.is_set():
+        raise _SearchCancelled
+
+
+def _block_heavy_resources(route) -> None:
+    if is_blocked(route.request.resource_type, route.request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+# ---------------------------------------------------------------------------
+# Per-thread browser lifecycle
+# ---------------------------------------------------------------------------
+
+def _get_browser():
+    """Return this worker thread's Chromium instance, launching it on first use."""
+    browser = getattr(_thread_state, "browser", None)
+    if browser is not None and browser.is_connected():
+        return browser
+
+    pw = getattr(_thread_state, "playwright", None)
+    if pw is None:
+        # sync_playwright creates its own asyncio event loop internally via
+        # asyncio.new_event_loop(). On Windows, the loop type is determined by
+        # the active policy. We must set ProactorEventLoopPolicy here, inside
+        # the worker thread, before sync_playwright initialises.
+        if sys.platform == "win32":
+            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        pw = sync_playwright().start()
+        _thread_state.playwright = pw
+
+    browser = pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+    _thread_state.browser = browser
+    return browser
+
+
+def _warm_thread_browser(barrier: threading.Barrier) -> None:
+    # Same barrier trick as shutdown: one launch per worker thread
+    try:
+        barrier.wait(timeout=5)
+    except threading.BrokenBarrierError:
+        pass
+    _get_browser()
+
+
+def warmup() -> None:
+    """
+    Launch Chromium on every worker in the background (called on app startup),
+    so the first Delaware search doesn't pay driver + browser cold start.
+    Returns immediately; a failed launch is simply retried on first use.
+    """
+    barrier = threading.Barrier(MAX_WORKERS)
+    for _ in range(MAX_WORKERS):
+        _executor.submit(_warm_thread_browser, barrier)
+
+
+def _close_thread_browser(barrier: threading.Barrier) -> None:
+    # The barrier holds each task on its own worker until all have arrived,
+    # so every thread gets exactly one close call.
+    try:
+        barrier.wait(timeout=5)
+    except threading.BrokenBarrierError:
+        pass
+
+    browser = getattr(_thread_state, "browser", None)
+    pw = getattr(_thread_state, "playwright", None)
+    _thread_state.browser = None
+    _thread_state.playwright = None
+    try:
+        if browser is not None:
+            browser.close()
+    finally:
+        if pw is not None:
+            pw.stop()
+
+
+def shutdown(timeout: float = 15.0) -> None:
+    """Close every worker's browser and Playwright driver (called on app shutdown)."""
+    barrier = threading.Barrier(MAX_WORKERS)
+    futures = [_executor.submit(_close_thread_browser, barrier) for _ in range(MAX_WORKERS)]
+    wait(futures, timeout=timeout)
@@ -9,17 +9,27 @@ session cookies). The solution is a two-step session approach:
   2. GET the results URL with those cookies + Referer header — the server now
      treats the request as coming from a legitimate form submission.
 
-HTML is parsed with Python's built-in html.parser (no external dependencies).
+The client (and its cookie jar) lives for the whole process, so step 1 runs once
+on cold start and again only if Sunbiz starts answering 403 (session expired).
+The results page is streamed and reading stops once the results </tbody> closes.
+
+Rows are pulled from the <tbody> with one precompiled regex; if the markup ever
+stops matching it, parsing falls back to lxml (libxml2, in C).
 
 FL returns all entity statuses (Active, INACT, CROSS RF, RPEND/UA, etc.).
 Results table has 3 columns: Corporate Name | Document Number | Status.
 An empty <tbody> means no results — no LLM call needed.
 """
-from html.parser import HTMLParser
+import asyncio
+import copy
+import re
+from html import unescape
 
 import httpx
+from lxml import html as lx
 
-from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch
+from adapters._cache import TTLCache
+from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch, normalize_name
 
 FORM_URL = "https://search.sunbiz.org/Inquiry/CorporationSearch/ByName"
 RESULTS_URL = "https://search.sunbiz.org/Inquiry/CorporationSearch/SearchResults"
@@ -32,17 +42,37 @@ _HEADERS = {
     ),
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
+    # br needs the brotli package (httpx[brotli]); httpx decodes both transparently
+    "Accept-Encoding": "br, gzip",
 }
 
-_INACTIVE_STATUSES = {
+# Statuses are lower-cased when rows are parsed, so membership needs no
+# further normalising
+_INACTIVE_STATUSES = frozenset({
     "inact", "inactive", "cross rf", "dissolved", "revoked",
     "cancelled", "canceled", "merged", "converted", "withdrawn",
-}
+})
 
 NO_RESULTS_TEXT = [
     "no filings", "no matching", "no records", "no results",
     "0 results", "not found",
 ]
+# Matched against the raw body bytes (the phrases are ASCII), case-insensitively,
+# so no-results pages are never decoded or lowercased
+_NO_RESULTS_RE = re.compile(
+    b"|".join(re.escape(p.encode()) for p in NO_RESULTS_TEXT), re.IGNORECASE,
+)
+
+# Everything after the results table body is page chrome — no need to download it
+_TBODY_END_RE = re.compile(rb"</tbody\s*>", re.IGNORECASE)
+STREAM_CHUNK_BYTES = 65_536
+
+# Classified results keyed by casefolded search term; error responses are not cached
+_cache = TTLCache(maxsize=1024, ttl=300)
+
+_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
+_cookies_primed = False
 
 
 class FloridaAdapter(BaseStateAdapter):
@@ -50,31 +80,17 @@ class FloridaAdapter(BaseStateAdapter):
     state_name = "Florida"
 
     async def search(self, name: str, entity_type: str) -> AdapterResult:
-        try:
-            async with httpx.AsyncClient(
-                headers=_HEADERS,
-                follow_redirects=True,
-                timeout=30.0,
-            ) as client:
-                # Step 1: Warm the session — Sunbiz sets cookies on the form page
-                # that are required before it will serve results.
-                await client.get(FORM_URL)
-
-                # Step 2: Fetch results with session cookies + Referer in place.
-                resp = await client.get(
-                    RESULTS_URL,
-                    params={
-                        "inquiryType": "EntityName",
-                        "inquiryDirective": "StartsWith",
-                        "allCurrentNames": "true",
-                        "corporationNameSearchTerm": name.strip(),
-                        "Search": "Search",
-                    },
-                    headers={"Referer": FORM_URL},
-                )
-                resp.raise_for_status()
+        key = name.strip().casefold()
+        cached = _cache.get(key)
+        if cached is not None:
+            # Hand out a copy so a caller mutating its lists can never poison the cache
+            return copy.deepcopy(cached)
 
-            return self._parse_html(resp.text, name)
+        try:
+            body, encoding = await _fetch_results(await _get_client(), name)
+            result = self._parse_html(body, encoding, name)
+            _cache.set(key, result)
+            return copy.deepcopy(result)
 
         except httpx.TimeoutException:
             return AdapterResult(
@@ -101,10 +117,9 @@ class FloridaAdapter(BaseStateAdapter):
                 notes=f"Unexpected error: {type(exc).__name__}: {exc}",
             )
 
-    def _parse_html(self, html: str, name: str) -> AdapterResult:
+    def _parse_html(self, body: bytes, encoding: str, name: str) -> AdapterResult:
         """Parse the Sunbiz results page HTML and classify matches."""
-        lower = html.lower()
-        if any(phrase in lower for phrase in NO_RESULTS_TEXT):
+        if _NO_RESULTS_RE.search(body):
             return AdapterResult(
                 state_code=self.state_code,
                 state_name=self.state_name,
@@ -114,10 +129,9 @@ class FloridaAdapter(BaseStateAdapter):
                 source_type="api",
             )
 
-        parser = _TableParser()
-        parser.feed(html)
+        rows = _extract_rows(body.decode(encoding, errors="replace"), normalize_name(name))
 
-        if not parser.rows:
+        if not rows:
             # Table present but empty, or no table — both mean no results on Sunbiz
             return AdapterResult(
                 state_code=self.state_code,
@@ -132,25 +146,27 @@ class FloridaAdapter(BaseStateAdapter):
             EntityMatch(
                 name=row[0],
                 entity_type="",
-                status=row[2] if len(row) > 2 else "unknown",
+                status=row[2].lower() if len(row) > 2 else "unknown",
                 file_number=row[1] if len(row) > 1 else "",
                 registered="",
             )
-            for row in parser.rows
+            for row in rows
             if row and row[0]
         ]
 
         return self._classify(matches, name)
 
     def _classify(self, matches: list[EntityMatch], search_name: str) -> AdapterResult:
-        name_upper = search_name.strip().upper()
-        exact = [m for m in matches if m.name.strip().upper() == name_upper]
-        similar = [m for m in matches if m not in exact]
+        name_key = normalize_name(search_name)
+        exact: list[EntityMatch] = []
+        similar: list[EntityMatch] = []
+        for m in matches:
+            (exact if m.name_key == name_key else similar).append(m)
 
         if exact:
-            active_exact = [m for m in exact if m.status.lower() not in _INACTIVE_STATUSES]
+            all_inactive = all(m.status in _INACTIVE_STATUSES for m in exact)
             note = f"Exact match found: '{exact[0].name}' (status: {exact[0].status})."
-            if not active_exact:
+            if all_inactive:
                 note += (
                     " All exact matches are inactive —"
                     " name may be available, but verify with an attorney."
@@ -160,7 +176,7 @@ class FloridaAdapter(BaseStateAdapter):
                 state_name=self.state_name,
                 availability="taken",
                 confidence=self._build_confidence("primary", "clear"),
-                raw_matches=[m.__dict__ for m in exact],
+                raw_matches=exact,
                 similar_names=[m.name for m in similar],
                 notes=note,
                 source_type="api",
@@ -171,7 +187,7 @@ class FloridaAdapter(BaseStateAdapter):
             state_name=self.state_name,
             availability="similar",
             confidence=self._build_confidence("primary", "inferred"),
-            raw_matches=[m.__dict__ for m in matches],
+            raw_matches=matches,
             similar_names=[m.name for m in matches],
             notes=f"{len(matches)} similar name(s) found in Florida registry. No exact match.",
             source_type="api",
@@ -179,54 +195,155 @@ class FloridaAdapter(BaseStateAdapter):
 
 
 # ---------------------------------------------------------------------------
-# HTML parser
+# Session
+# ---------------------------------------------------------------------------
+
+async def _get_client() -> httpx.AsyncClient:
+    """Return the shared Sunbiz client, warming its session cookies on first use."""
+    global _client, _cookies_primed
+    async with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.AsyncClient(
+                headers=_HEADERS,
+                follow_redirects=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                http2=True,
+            )
+            _cookies_primed = False
+        if not _cookies_primed:
+            # Step 1: Warm the session — Sunbiz sets cookies on the form page
+            # that are required before it will serve results.
+            await _client.get(FORM_URL)
+            _cookies_primed = True
+        return _client
+
+
+async def _fetch_results(
+    client: httpx.AsyncClient, name: str, *, retry_forbidden: bool = True,
+) -> tuple[bytes, str]:
+    """Return the results page bytes, up to the end of the results table body, and their encoding."""
+    # Step 2: Fetch results with session cookies + Referer in place.
+    async with client.stream(
+        "GET",
+        RESULTS_URL,
+        params={
+            "inquiryType": "EntityName",
+            "inquiryDirective": "StartsWith",
+            "allCurrentNames": "true",
+            "corporationNameSearchTerm": name.strip(),
+            "Search": "Search",
+        },
+        headers={"Referer": FORM_URL},
+    ) as resp:
+        if resp.status_code != 403 or not retry_forbidden:
+            resp.raise_for_status()
+            return await _read_until_table_end(resp)
+
+    # Session cookies expired — warm a fresh session and retry once
+    await _reset_session()
+    return await _fetch_results(await _get_client(), name, retry_forbidden=False)
+
+
+async def _read_until_table_end(resp: httpx.Response) -> tuple[bytes, str]:
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes(STREAM_CHUNK_BYTES):
+        # Re-scan a few bytes of the previous chunk in case the tag straddles the boundary
+        start = max(len(buf) - 16, 0)
+        buf += chunk
+        if _TBODY_END_RE.search(buf, start):
+            break
+    return bytes(buf), resp.charset_encoding or "utf-8"
+
+
+async def _reset_session() -> None:
+    global _cookies_primed
+    async with _client_lock:
+        if _client is not None:
+            _client.cookies.clear()
+        _cookies_primed = False
+
+
+async def close_client() -> None:
+    """Close the shared Sunbiz client (called on app shutdown)."""
+    global _client, _cookies_primed
+    async with _client_lock:
+        if _client is not None:
+            await _client.aclose()
+        _client = None
+        _cookies_primed = False
+
+
+# ---------------------------------------------------------------------------
+# HTML parsing
 # ---------------------------------------------------------------------------
 
-class _TableParser(HTMLParser):
-    """
-    Extracts rows from the first <tbody> in the Sunbiz results page.
-    Columns: Corporate Name (0) | Document Number (1) | Status (2).
-    The entity name is inside an <a> tag — convert_charrefs=True handles
-    HTML entities automatically so handle_data receives clean text.
-    """
-
-    def __init__(self):
-        super().__init__(convert_charrefs=True)
-        self._table_depth = 0
-        self._in_tbody = False
-        self._in_tr = False
-        self._in_td = False
-        self._current_row: list[str] = []
-        self._current_text = ""
-        self.rows: list[list[str]] = []
-
-    def handle_starttag(self, tag, attrs):
-        if tag == "table":
-            self._table_depth += 1
-        elif tag == "tbody" and self._table_depth == 1:
-            self._in_tbody = True
-        elif tag == "tr" and self._in_tbody:
-            self._in_tr = True
-            self._current_row = []
-        elif tag == "td" and self._in_tr:
-            self._in_td = True
-            self._current_text = ""
-
-    def handle_endtag(self, tag):
-        if tag == "table":
-            self._table_depth -= 1
-            if self._table_depth == 0:
-                self._in_tbody = False
-        elif tag == "tbody":
-            self._in_tbody = False
-        elif tag == "tr" and self._in_tbody:
-            self._in_tr = False
-            if self._current_row:
-                self.rows.append(self._current_row[:])
-        elif tag == "td" and self._in_tr:
-            self._in_td = False
-            self._current_row.append(self._current_text.strip())
-
-    def handle_data(self, data):
-        if self._in_td:
-            self._current_text += data
+# Rows of the <tbody> of each outermost table
+_ROWS_XPATH = "//table[not(ancestor::table)]/tbody/tr"
+
+# Fast path for the known 3-column layout: Corporate Name (in an <a>) | Document Number | Status
+_TBODY_START_RE = re.compile(r"<tbody[^>]*>", re.IGNORECASE)
+_TBODY_CLOSE_RE = re.compile(r"</tbody\s*>", re.IGNORECASE)
+_ROW_RE = re.compile(
+    r"<tr[^>]*>\s*<td[^>]*>(.*?)</td>\s*<td[^>]*>(.*?)</td>\s*<td[^>]*>(.*?)</td>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Once the exact name's row is seen the result is "taken" — keep only this many
+# further rows as similar-name context instead of walking the rest of the table
+ROWS_AFTER_EXACT = 5
+
+
+def _extract_rows(html: str, name_key: str) -> list[list[str]]:
+    """Return the results-table rows as lists of stripped cell text."""
+    if not html.strip():
+        return []
+    return _regex_rows(html, name_key) or _parse_rows(html, name_key)
+
+
+def _regex_rows(html: str, name_key: str) -> list[list[str]]:
+    """Regex sweep over the first <tbody>; empty if it has no rows or an unexpected shape."""
+    start = _TBODY_START_RE.search(html)
+    if start is None:
+        return []
+    close = _TBODY_CLOSE_RE.search(html, start.end())
+    end = close.start() if close else len(html)
+
+    rows = []
+    remaining = None
+    last_end = start.end()
+    for m in _ROW_RE.finditer(html, start.end(), end):
+        row = [unescape(_TAG_RE.sub("", cell)).strip() for cell in m.groups()]
+        rows.append(row)
+        last_end = m.end()
+        remaining = _rows_left(row, name_key, remaining)
+        if remaining == 0:
+            break
+    # A row the regex skipped (or merged into its neighbour) means the layout changed
+    if len(rows) != html.count("<tr", start.end(), last_end):
+        return []
+    return rows
+
+
+def _parse_rows(html: str, name_key: str) -> list[list[str]]:
+    tree = lx.fromstring(html)
+    rows = []
+    remaining = None
+    for tr in tree.xpath(_ROWS_XPATH):
+        cells = [td.text_content().strip() for td in tr.xpath("./td")]
+        if cells:
+            rows.append(cells)
+            remaining = _rows_left(cells, name_key, remaining)
+            if remaining == 0:
+                break
+    return rows
+
+
+def _rows_left(row: list[str], name_key: str, remaining: int | None) -> int | None:
+    """Rows still wanted after this one — None until the exact match has been seen."""
+    if remaining is not None:
+        return remaining - 1
+    if normalize_name(row[0]) == name_key:
+        return ROWS_AFTER_EXACT
+    return None
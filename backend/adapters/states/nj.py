@@ -7,14 +7,30 @@ This avoids the Windows "Racing with another loop to spawn a process" RuntimeErr
 that occurs when sync_playwright tries to spawn a subprocess from inside a thread
 that shares asyncio state with the main event loop.
 
+Chromium itself is shared (adapters._browser); each search only opens a page in
+a pooled browser's long-lived context, so the portal session carries over.
+
+Before reaching for a browser at all, the search form is posted directly with
+httpx (anti-forgery token scraped from the form page and reused for
+TOKEN_TTL seconds). Its answer is only trusted when it parses real result
+rows; anything else — including a "no records" page, which a wrong field name
+or endpoint would also produce — goes to Playwright.
+
 NJ returns: Business Name, Entity ID, Business Type, Status, Date Incorporated.
 The search is prefix-based — returns all entities starting with the entered name.
 """
 import asyncio
+import re
+import time
 
-from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+import httpx
+from lxml import html as lx
+from playwright.async_api import TimeoutError as PWTimeout
 
-from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch
+from adapters._browser import browser_page
+from adapters._concurrency import SingleFlight
+from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch, normalize_name
+from llm.client import interpret_state_page
 
 SEARCH_URL = "https://www.njportal.com/DOR/BusinessNameSearch/Search/BusinessName"
 
@@ -39,11 +55,81 @@ RESULTS_TABLE_SELECTORS = [
     ".search-results table",
     "table",
 ]
+# XPath equivalents of RESULTS_TABLE_SELECTORS for the httpx path, minus the
+# bare "table": without a recognised results container the page goes to the
+# browser rather than risk parsing a layout table
+RESULTS_TABLE_XPATHS = [
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' table ')]//tr",
+    "//*[@id='searchResults']//table//tr",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' search-results ')]//table//tr",
+]
 NO_RESULTS_TEXT = [
     "no results", "no records", "not found", "no entities",
     "no businesses", "0 results", "0 records",
 ]
 
+# Header keywords per semantic column, in priority order (first group wins)
+_COLUMN_KEYWORDS = {
+    "name": ("business name", "entity name", "name"),
+    "id": ("entity id", "entity number", "file", "id"),
+    "type": ("type", "entity type", "business type"),
+    "status": ("status",),
+    "date": ("date", "incorporated", "formed", "registered"),
+}
+_COLUMN_PRIORITY = tuple(_COLUMN_KEYWORDS)
+_HEADER_KEYWORDS = {kw: col for col, kws in _COLUMN_KEYWORDS.items() for kw in kws}
+# Shorter keywords nested in longer ones ("name" in "business name") map to the
+# same column, so whichever alternative matches first doesn't matter
+_HEADER_RE = re.compile("|".join(map(re.escape, _HEADER_KEYWORDS)))
+
+# Resolves as soon as the search has rendered either a data row or a no-results message
+_RESULTS_READY_JS = """(phrases) => {
+    if (document.querySelector('table tbody tr td')) return true;
+    const text = document.body ? document.body.innerText.toLowerCase() : '';
+    return phrases.some(p => text.includes(p));
+}"""
+
+# Phrase check runs in the page so only a boolean crosses CDP, not the body text
+_HAS_NO_RESULTS_JS = """(phrases) => {
+    const text = document.body ? document.body.innerText.toLowerCase() : '';
+    return phrases.some(p => text.includes(p));
+}"""
+
+# Cell text of every row under each candidate table selector, all in one CDP
+# round trip. Header row reads th + td, data rows read td only (matching how
+# the columns are indexed).
+_TABLES_JS = """(selectors) => selectors.map(sel =>
+    Array.from(document.querySelectorAll(`${sel} tr`), (tr, i) =>
+        Array.from(tr.querySelectorAll(i === 0 ? 'th, td' : 'td'), c => c.innerText.trim())
+    )
+)"""
+
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+_TOKEN_RE = re.compile(rb'name="__RequestVerificationToken"[^>]*?value="([^"]+)"')
+TOKEN_TTL = 600.0
+HTTP_TIMEOUT = 20.0
+
+_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
+_token: str | None = None
+_token_expires = 0.0
+
+# Identical searches already in flight share one browser/HTTP run
+_inflight = SingleFlight()
+
+# Last selector that worked per candidate list — tried alone first next time
+_selector_hits: dict[str, str] = {}
+CACHED_SELECTOR_TIMEOUT = 2_000
+
 
 class NewJerseyAdapter(BaseStateAdapter):
     state_code = "NJ"
@@ -51,6 +137,10 @@ class NewJerseyAdapter(BaseStateAdapter):
 
     async def search(self, name: str, entity_type: str) -> AdapterResult:
         """Async entry point — runs async_playwright directly in the event loop."""
+        key = (normalize_name(name), entity_type.upper())
+        return await _inflight.do(key, lambda: self._search(name, entity_type))
+
+    async def _search(self, name: str, entity_type: str) -> AdapterResult:
         try:
             return await asyncio.wait_for(
                 self._run(name, entity_type),
@@ -78,33 +168,56 @@ class NewJerseyAdapter(BaseStateAdapter):
     # ------------------------------------------------------------------
 
     async def _run(self, name: str, entity_type: str) -> AdapterResult:
-        """Launch browser, navigate to search page, and return results."""
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            )
-            page = await context.new_page()
-            try:
-                await page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=30_000)
-                return await self._fill_and_extract(page, name, entity_type)
-            finally:
-                await browser.close()
+        try:
+            result = await self._search_http(name)
+        except Exception:
+            # Token scrape / post failed — drop the token and let the browser try
+            await _invalidate_token()
+            result = None
+        if result is not None:
+            return result
+        return await self._run_browser(name, entity_type)
+
+    async def _search_http(self, name: str) -> AdapterResult | None:
+        """
+        Post the search form without a browser. Returns None unless the
+        response holds result rows, so the caller falls back to Playwright —
+        a no-results page here is never taken as "available", since the
+        posted form hasn't been checked against the live portal.
+        """
+        client = await _get_client()
+        token = await _get_token(client)
+        resp = await client.post(
+            SEARCH_URL,
+            data={"businessName": name.strip(), "__RequestVerificationToken": token},
+            headers={"Referer": SEARCH_URL},
+        )
+        resp.raise_for_status()
+
+        tree = lx.fromstring(resp.content)
+        candidates = [
+            [
+                [c.text_content().strip() for c in tr.xpath("./th | ./td" if i == 0 else "./td")]
+                for i, tr in enumerate(tree.xpath(xpath))
+            ]
+            for xpath in RESULTS_TABLE_XPATHS
+        ]
+        matches = _matches_from_tables(candidates)
+        if not matches:
+            return None
+        return self._classify(matches, name)
+
+    async def _run_browser(self, name: str, entity_type: str) -> AdapterResult:
+        """Open a page on a pooled browser, navigate to search page, and return results."""
+        async with browser_page() as page:
+            # Return on commit — the input-selector wait in _fill_and_extract is
+            # what actually gates on the form being there
+            await page.goto(SEARCH_URL, wait_until="commit", timeout=30_000)
+            return await self._fill_and_extract(page, name, entity_type)
 
     async def _fill_and_extract(self, page, name: str, entity_type: str) -> AdapterResult:
         # Find the name input field
-        input_sel = None
-        for sel in NAME_INPUT_SELECTORS:
-            try:
-                await page.wait_for_selector(sel, timeout=8_000)
-                input_sel = sel
-                break
-            except PWTimeout:
-                continue
+        input_sel = await _first_selector(page, "input", NAME_INPUT_SELECTORS, timeout=8_000)
 
         if not input_sel:
             return AdapterResult(
@@ -120,13 +233,14 @@ class NewJerseyAdapter(BaseStateAdapter):
 
         # Click submit
         submitted = False
-        for sel in SUBMIT_SELECTORS:
+        submit_sel = await _first_selector(page, "submit", SUBMIT_SELECTORS, timeout=5_000)
+        if submit_sel:
             try:
-                await page.click(sel, timeout=5_000)
+                # Don't wait on the navigation commit — _RESULTS_READY_JS covers that
+                await page.click(submit_sel, timeout=5_000, no_wait_after=True)
                 submitted = True
-                break
             except Exception:
-                continue
+                pass
 
         if not submitted:
             return AdapterResult(
@@ -138,29 +252,23 @@ class NewJerseyAdapter(BaseStateAdapter):
                 extraction_method="failed",
             )
 
-        # Wait for results to load
+        # Wait for results (or a no-results message) rather than networkidle
         try:
-            await page.wait_for_load_state("networkidle", timeout=20_000)
+            await page.wait_for_function(_RESULTS_READY_JS, arg=NO_RESULTS_TEXT, timeout=15_000)
         except PWTimeout:
             pass  # parse whatever loaded
 
         return await self._parse_results(page, name, entity_type)
 
     async def _parse_results(self, page, name: str, entity_type: str) -> AdapterResult:
-        page_text = (await page.inner_text("body")).lower()
-
-        if any(phrase in page_text for phrase in NO_RESULTS_TEXT):
-            return AdapterResult(
-                state_code=self.state_code,
-                state_name=self.state_name,
-                availability="available",
-                confidence=self._build_confidence("primary", "clear"),
-                notes="No matching entities found in New Jersey registry.",
-            )
+        if await page.evaluate(_HAS_NO_RESULTS_JS, NO_RESULTS_TEXT):
+            return self._no_results()
 
         matches = await self._parse_table(page)
         if not matches:
-            # No table found but no explicit "no results" either — use LLM fallback
+            # No table found but no explicit "no results" either — only now
+            # pull the full body text, for the LLM fallback
+            page_text = await page.inner_text("body")
             return await self._llm_fallback(page_text, name, entity_type)
 
         return self._classify(matches, name)
@@ -171,52 +279,27 @@ class NewJerseyAdapter(BaseStateAdapter):
         Expected columns: Business Name | Entity ID | Business Type | Status | Date
         Tries multiple table selectors in case of markup changes.
         """
-        matches: list[EntityMatch] = []
-
-        for table_sel in RESULTS_TABLE_SELECTORS:
-            try:
-                if await page.locator(table_sel).count() == 0:
-                    continue
-                rows = await page.locator(f"{table_sel} tr").all()
-                if len(rows) < 2:
-                    continue  # header only — no data rows
-
-                # Detect column positions from header row
-                header_loc = rows[0].locator("th, td")
-                n_headers = await header_loc.count()
-                header_texts = []
-                for i in range(n_headers):
-                    text = await header_loc.nth(i).inner_text()
-                    header_texts.append(text.strip().lower())
-                col = _col_index(header_texts)
-
-                for row in rows[1:]:
-                    cells_loc = row.locator("td")
-                    cell_count = await cells_loc.count()
-                    if cell_count == 0:
-                        continue
-                    cells = [cells_loc.nth(i) for i in range(cell_count)]
-                    entity_name = await _cell(cells, col.get("name", 0))
-                    if not entity_name:
-                        continue
-                    matches.append(EntityMatch(
-                        name=entity_name,
-                        entity_type=await _cell(cells, col.get("type", -1)),
-                        status=await _cell(cells, col.get("status", -1)) or "unknown",
-                        file_number=await _cell(cells, col.get("id", -1)),
-                        registered=await _cell(cells, col.get("date", -1)),
-                    ))
-                if matches:
-                    break  # found a working table
-            except Exception:
-                continue
+        try:
+            candidates = await page.evaluate(_TABLES_JS, RESULTS_TABLE_SELECTORS)
+        except Exception:
+            return []
+        return _matches_from_tables(candidates)
 
-        return matches
+    def _no_results(self) -> AdapterResult:
+        return AdapterResult(
+            state_code=self.state_code,
+            state_name=self.state_name,
+            availability="available",
+            confidence=self._build_confidence("primary", "clear"),
+            notes="No matching entities found in New Jersey registry.",
+        )
 
     def _classify(self, matches: list[EntityMatch], search_name: str) -> AdapterResult:
-        name_upper = search_name.strip().upper()
-        exact = [m for m in matches if m.name.strip().upper() == name_upper]
-        similar = [m for m in matches if m not in exact]
+        name_key = normalize_name(search_name)
+        exact: list[EntityMatch] = []
+        similar: list[EntityMatch] = []
+        for m in matches:
+            (exact if m.name_key == name_key else similar).append(m)
 
         if exact:
             return AdapterResult(
@@ -224,7 +307,7 @@ class NewJerseyAdapter(BaseStateAdapter):
                 state_name=self.state_name,
                 availability="taken",
                 confidence=self._build_confidence("primary", "clear"),
-                raw_matches=[m.__dict__ for m in exact],
+                raw_matches=exact,
                 similar_names=[m.name for m in similar],
                 notes=f"Exact match found: '{exact[0].name}'",
             )
@@ -234,19 +317,17 @@ class NewJerseyAdapter(BaseStateAdapter):
             state_name=self.state_name,
             availability="similar",
             confidence=self._build_confidence("primary", "inferred"),
-            raw_matches=[m.__dict__ for m in matches],
+            raw_matches=matches,
             similar_names=[m.name for m in matches],
             notes=f"{len(matches)} similar name(s) found in NJ registry. No exact match.",
         )
 
     async def _llm_fallback(self, page_text: str, name: str, entity_type: str) -> AdapterResult:
-        from llm.client import interpret_state_page
-
         interpretation = await interpret_state_page(
             state_name=self.state_name,
             search_name=name,
             entity_type=entity_type,
-            page_text=page_text[:3000],
+            page_text=page_text,
         )
         return AdapterResult(
             state_code=self.state_code,
@@ -263,29 +344,152 @@ class NewJerseyAdapter(BaseStateAdapter):
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _matches_from_tables(candidates: list[list[list[str]]]) -> list[EntityMatch]:
+    """
+    Build matches from the first candidate table that yields any.
+    Each candidate is a list of rows of cell text; row 0 is the header.
+    """
+    matches: list[EntityMatch] = []
+    for rows in candidates:
+        try:
+            if len(rows) < 2:
+                continue  # header only — no data rows
+
+            # Detect column positions from header row
+            col = _col_index([text.lower() for text in rows[0]])
+
+            for cells in rows[1:]:
+                if not cells:
+                    continue
+                entity_name = _cell(cells, col.get("name", 0))
+                if not entity_name:
+                    continue
+                matches.append(EntityMatch(
+                    name=entity_name,
+                    entity_type=_cell(cells, col.get("type", -1)),
+                    status=_cell(cells, col.get("status", -1)) or "unknown",
+                    file_number=_cell(cells, col.get("id", -1)),
+                    registered=_cell(cells, col.get("date", -1)),
+                ))
+            if matches:
+                break  # found a working table
+        except Exception:
+            continue
+
+    return matches
+
+
+async def _first_selector(page, kind: str, selectors: list[str], timeout: int) -> str | None:
+    """
+    Return the selector to use for this candidate list, or None if none appears.
+
+    The selector that worked last time (per kind) is tried alone first with a
+    short timeout. Otherwise all candidates are awaited at once and the
+    highest-priority one present wins — worst case one timeout, not one per
+    candidate.
+    """
+    cached = _selector_hits.get(kind)
+    if cached is not None:
+        try:
+            await page.wait_for_selector(cached, timeout=CACHED_SELECTOR_TIMEOUT)
+            return cached
+        except PWTimeout:
+            pass  # markup changed — fall back to probing every candidate
+
+    winner = await _probe_selectors(page, selectors, timeout)
+    if winner is not None:
+        _selector_hits[kind] = winner
+    return winner
+
+
+async def _probe_selectors(page, selectors: list[str], timeout: int) -> str | None:
+    tasks = {
+        asyncio.ensure_future(page.wait_for_selector(sel, timeout=timeout)): sel
+        for sel in selectors
+    }
+    pending = set(tasks)
+    winner = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            found = [tasks[t] for t in done if t.exception() is None]
+            if found:
+                winner = min(found, key=selectors.index)
+    finally:
+        for t in pending:
+            t.cancel()
+
+    if winner is None:
+        return None
+    # A lower-priority candidate may have won the race — prefer any
+    # higher-priority one that is already on the page
+    for sel in selectors[:selectors.index(winner)]:
+        if await page.query_selector(sel) is not None:
+            return sel
+    return winner
+
+
 def _col_index(headers: list[str]) -> dict[str, int]:
     """Map semantic column names to their index from the header row."""
     mapping = {}
     for i, h in enumerate(headers):
-        if any(k in h for k in ("business name", "entity name", "name")):
-            mapping.setdefault("name", i)
-        elif any(k in h for k in ("entity id", "entity number", "file", "id")):
-            mapping.setdefault("id", i)
-        elif any(k in h for k in ("type", "entity type", "business type")):
-            mapping.setdefault("type", i)
-        elif any(k in h for k in ("status",)):
-            mapping.setdefault("status", i)
-        elif any(k in h for k in ("date", "incorporated", "formed", "registered")):
-            mapping.setdefault("date", i)
+        hits = {_HEADER_KEYWORDS[m.group(0)] for m in _HEADER_RE.finditer(h)}
+        if hits:
+            # A header hitting several groups goes to the highest-priority one
+            mapping.setdefault(min(hits, key=_COLUMN_PRIORITY.index), i)
     return mapping
 
 
-async def _cell(cells: list, index: int) -> str:
+def _cell(cells: list[str], index: int) -> str:
     """Safely get text from a cell by index."""
     if index < 0 or index >= len(cells):
         return ""
-    try:
-        text = await cells[index].inner_text()
-        return text.strip()
-    except Exception:
-        return ""
+    return cells[index]
+
+
+# ---------------------------------------------------------------------------
+# Browserless session
+# ---------------------------------------------------------------------------
+
+async def _get_client() -> httpx.AsyncClient:
+    global _client
+    async with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.AsyncClient(
+                headers=_HEADERS,
+                follow_redirects=True,
+                timeout=HTTP_TIMEOUT,
+                http2=True,
+            )
+        return _client
+
+
+async def _get_token(client: httpx.AsyncClient) -> str:
+    """Anti-forgery token from the search form; its cookie half lives in the client's jar."""
+    global _token, _token_expires
+    async with _client_lock:
+        if _token is None or time.monotonic() >= _token_expires:
+            resp = await client.get(SEARCH_URL)
+            resp.raise_for_status()
+            found = _TOKEN_RE.search(resp.content)
+            if found is None:
+                raise ValueError("NJ anti-forgery token not found on search page")
+            _token = found.group(1).decode()
+            _token_expires = time.monotonic() + TOKEN_TTL
+        return _token
+
+
+async def _invalidate_token() -> None:
+    global _token
+    async with _client_lock:
+        _token = None
+
+
+async def close_client() -> None:
+    """Close the NJ httpx client (called on app shutdown)."""
+    global _client, _token
+    async with _client_lock:
+        if _client is not None:
+            await _client.aclose()
+        _client = None
+        _token = None
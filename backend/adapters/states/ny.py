@@ -15,14 +15,28 @@ Columns used:
   initial_dos_filing_date — formation date (ISO 8601)
   county, jurisdiction — location info
 """
+
+import asyncio
+from operator import itemgetter
+
 import httpx
+import orjson
 
+from adapters._cache import TTLCache
+from adapters._http import get_client
 from adapters.base import AdapterResult, BaseStateAdapter, EntityMatch
 
 SODA_URL = "https://data.ny.gov/resource/n9v6-gdp6.json"
 LIMIT = 100
 TIMEOUT = 20.0
 
+# (exact rows, prefix rows) keyed by (name, entity type), both upper-cased;
+# failed queries raise out of the loader and are not cached
+_cache = TTLCache(maxsize=4096, ttl=900)
+
+# C-level row accessor for the fast path of _to_match
+_ROW_FIELDS = itemgetter("current_entity_name", "entity_type", "dos_id", "initial_dos_filing_date")
+
 
 class NewYorkAdapter(BaseStateAdapter):
     state_code = "NY"
@@ -33,24 +47,10 @@ class NewYorkAdapter(BaseStateAdapter):
         name_with_suffix = f"{name_upper} {entity_type.upper()}"
 
         try:
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                # 1. Exact name match (bare name and name + entity type suffix)
-                exact, exact2 = await _fetch_two(
-                    client,
-                    f"upper(current_entity_name)='{_esc(name_upper)}'",
-                    f"upper(current_entity_name)='{_esc(name_with_suffix)}'",
-                )
-                exact_matches = exact + exact2
-
-                # 2. Similar names — all active entities starting with the search term
-                similar_resp = await client.get(SODA_URL, params={
-                    "$where": f"upper(current_entity_name) like '{_esc(name_upper)}%'",
-                    "$limit": LIMIT,
-                    "$order": "current_entity_name",
-                })
-                similar_resp.raise_for_status()
-                all_matches = similar_resp.json()
-
+            exact_matches, all_matches = await _cache.get_or_load(
+                (name_upper, entity_type.upper()),
+                lambda: _query(name_upper, name_with_suffix),
+            )
         except httpx.TimeoutException:
             return AdapterResult(
                 state_code=self.state_code,
@@ -72,10 +72,16 @@ class NewYorkAdapter(BaseStateAdapter):
 
     def _classify(self, exact_matches, all_matches, search_name: str) -> AdapterResult:
         exact = [_to_match(m) for m in exact_matches]
+        exact_names = {m.name_key for m in exact}
 
-        all_entity = [_to_match(m) for m in all_matches]
-        exact_names = {m.name.upper() for m in exact}
-        similar_only = [m for m in all_entity if m.name.upper() not in exact_names]
+        # Convert and partition the prefix rows in one pass
+        all_entity: list[EntityMatch] = []
+        similar_only: list[EntityMatch] = []
+        for row in all_matches:
+            m = _to_match(row)
+            all_entity.append(m)
+            if m.name_key not in exact_names:
+                similar_only.append(m)
 
         if exact:
             return AdapterResult(
@@ -83,7 +89,7 @@ class NewYorkAdapter(BaseStateAdapter):
                 state_name=self.state_name,
                 availability="taken",
                 confidence=self._build_confidence("primary", "clear"),
-                raw_matches=[m.__dict__ for m in exact],
+                raw_matches=exact,
                 similar_names=[m.name for m in similar_only],
                 notes=f"Exact match found: '{exact[0].name}'",
                 source_type="api",
@@ -95,7 +101,7 @@ class NewYorkAdapter(BaseStateAdapter):
                 state_name=self.state_name,
                 availability="similar",
                 confidence=self._build_confidence("primary", "inferred"),
-                raw_matches=[m.__dict__ for m in all_entity],
+                raw_matches=all_entity,
                 similar_names=[m.name for m in all_entity],
                 notes=f"{len(all_entity)} similar active NY entity name(s) found. No exact match.",
                 source_type="api",
@@ -121,20 +127,58 @@ def _esc(s: str) -> str:
 
 
 def _to_match(row: dict) -> EntityMatch:
-    filed = row.get("initial_dos_filing_date", "")
+    try:
+        name, entity_type, dos_id, filed = _ROW_FIELDS(row)
+    except KeyError:
+        # SODA omits null columns from a row — fall back to per-field lookups
+        name = row.get("current_entity_name", "")
+        entity_type = row.get("entity_type", "")
+        dos_id = row.get("dos_id", "")
+        filed = row.get("initial_dos_filing_date", "")
     return EntityMatch(
-        name=row.get("current_entity_name", ""),
-        entity_type=row.get("entity_type", ""),
+        name=name or "",
+        entity_type=entity_type or "",
         status="active",
-        file_number=row.get("dos_id", ""),
+        file_number=dos_id or "",
         registered=filed[:10] if filed else "",
     )
 
 
-async def _fetch_two(client, where1: str, where2: str):
-    """Fire two SODA queries sequentially and return both result lists."""
-    r1 = await client.get(SODA_URL, params={"$where": where1, "$limit": 10})
-    r2 = await client.get(SODA_URL, params={"$where": where2, "$limit": 10})
-    r1.raise_for_status()
-    r2.raise_for_status()
-    return r1.json(), r2.json()
+async def _query(name_upper: str, name_with_suffix: str) -> tuple[list[dict], list[dict]]:
+    """Return (exact rows, prefix rows) from SODA; raises on HTTP errors."""
+    client = get_client()
+    # 1. Similar names — all active entities starting with the search term.
+    # Both exact forms (bare name, name + entity type suffix) start with it
+    # too, so exact matches are picked out of this one result locally.
+    similar_resp = await client.get(SODA_URL, params={
+        "$where": f"upper(current_entity_name) like '{_esc(name_upper)}%'",
+        "$limit": LIMIT,
+        "$order": "current_entity_name",
+    }, timeout=TIMEOUT)
+    similar_resp.raise_for_status()
+    all_matches = orjson.loads(similar_resp.content)
+
+    exact_keys = {name_upper, name_with_suffix}
+    exact_matches = [
+        row for row in all_matches
+        if row.get("current_entity_name", "").strip().upper() in exact_keys
+    ]
+
+    # 2. Prefix results were cut off at LIMIT — the exact names may sit past
+    # the cut, so only then ask for them directly.
+    if not exact_matches and len(all_matches) >= LIMIT:
+        exact_resp, exact2_resp = await asyncio.gather(
+            client.get(SODA_URL, params={
+                "$where": f"upper(current_entity_name)='{_esc(name_upper)}'",
+                "$limit": 10,
+            }, timeout=TIMEOUT),
+            client.get(SODA_URL, params={
+                "$where": f"upper(current_entity_name)='{_esc(name_with_suffix)}'",
+                "$limit": 10,
+            }, timeout=TIMEOUT),
+        )
+        exact_resp.raise_for_status()
+        exact2_resp.raise_for_status()
+        exact_matches = orjson.loads(exact_resp.content) + orjson.loads(exact2_resp.content)
+
+    return exact_matches, all_matches
@@ -0,0 +1,34 @@
+"""
+In-process pub/sub for job progress.
+
+The orchestrator publishes each result row right after committing it, and the
+job runner publishes "done" once the final status is stored. Every SSE stream
+open on the job gets its own queue, so results reach the browser as soon as
+they are written instead of on the next database poll.
+"""
+import asyncio
+from typing import Any
+
+# job_id -> queues of the streams currently subscribed to it
+_subscribers: dict[str, set[asyncio.Queue]] = {}
+
+
+def subscribe(job_id: str) -> asyncio.Queue:
+    """Start receiving (event, payload) pairs for a job."""
+    queue: asyncio.Queue = asyncio.Queue()
+    _subscribers.setdefault(job_id, set()).add(queue)
+    return queue
+
+
+def unsubscribe(job_id: str, queue: asyncio.Queue) -> None:
+    queues = _subscribers.get(job_id)
+    if queues is not None:
+        queues.discard(queue)
+        if not queues:
+            del _subscribers[job_id]
+
+
+def publish(job_id: str, event: str, payload: Any) -> None:
+    """Hand an event to every stream subscribed to the job (no-op when none are)."""
+    for queue in _subscribers.get(job_id, ()):
+        queue.put_nowait((event, payload))
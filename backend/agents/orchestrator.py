@@ -4,6 +4,7 @@ Fans out state adapter searches + USPTO search in parallel using asyncio.
 Writes results to the database as they complete so the SSE stream can push them live.
 """
 import asyncio
+import logging
 
 from adapters.states.ca import CaliforniaAdapter
 from adapters.states.de import DelawareAdapter
@@ -11,10 +12,11 @@ from adapters.states.fl import FloridaAdapter
 from adapters.states.nj import NewJerseyAdapter
 from adapters.states.ny import NewYorkAdapter
 from adapters.states.wa import WashingtonAdapter
+from agents.events import publish
 from agents.uspto import search_uspto
 from database import AsyncSessionLocal
 from llm.client import analyze_similarity
-from models import StateResult
+from models import StateResult, UsptoResult
 from rules.engine import apply_rules, get_rules_summary
 
 # Registry: add new state adapters here as they are built
@@ -27,30 +29,62 @@ STATE_ADAPTERS = {
     "WA": WashingtonAdapter,
 }
 
+# Upper bound on state lookups (+ USPTO) running at once for a single job
+MAX_CONCURRENT_SEARCHES = 8
+
+logger = logging.getLogger(__name__)
+
 
 async def run_search(job_id: str, name: str, entity_type: str, states: list[str]) -> None:
     """
     Run all state lookups + USPTO in parallel, persisting results as they arrive.
+    All rows of a job go through one session, committed one at a time and
+    published to the job's SSE streams as soon as they land.
     """
-    tasks = []
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
 
+    coros = []
     for state_code in states:
         adapter_cls = STATE_ADAPTERS.get(state_code)
         if adapter_cls:
-            tasks.append(_run_state(job_id, name, entity_type, adapter_cls()))
+            coros.append(_run_state(job_id, name, entity_type, adapter_cls()))
 
     # USPTO always runs alongside state lookups
-    tasks.append(search_uspto(job_id, name))
+    coros.append(search_uspto(job_id, name))
 
-    await asyncio.gather(*tasks, return_exceptions=True)
+    tasks = [asyncio.ensure_future(_bounded(coro)) for coro in coros]
+    try:
+        async with AsyncSessionLocal() as db:
+            for next_row in asyncio.as_completed(tasks):
+                try:
+                    row = await next_row
+                except Exception:
+                    logger.exception("[job %s] search failed", job_id)
+                    continue
+                # A row that fails to land (locked DB, constraint error) is
+                # dropped on its own; the other searches keep running
+                try:
+                    db.add(row)
+                    await db.commit()
+                    publish(job_id, "uspto_result" if isinstance(row, UsptoResult) else "state_result", row)
+                except Exception:
+                    await db.rollback()
+                    logger.exception("[job %s] could not store %s result", job_id, type(row).__name__)
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
-async def _run_state(job_id: str, name: str, entity_type: str, adapter) -> None:
-    """Run a single state adapter, apply rules, optionally run similarity analysis, persist."""
+async def _run_state(job_id: str, name: str, entity_type: str, adapter) -> StateResult:
+    """Run a single state adapter, apply rules, optionally run similarity analysis; return the row to persist."""
     result = await adapter.search(name, entity_type)
 
     # Apply deterministic naming rules
-    flags = apply_rules(name, entity_type, adapter.state_code)
+    flags = list(apply_rules(name, entity_type, adapter.state_code))
 
     # If similar names found, run LLM similarity analysis
     if result.availability == "similar" and result.similar_names:
@@ -71,17 +105,14 @@ async def _run_state(job_id: str, name: str, entity_type: str, adapter) -> None:
         except Exception as e:
             flags.append(f"[SIMILARITY] Analysis failed: {e}")
 
-    async with AsyncSessionLocal() as db:
-        state_result = StateResult(
-            job_id=job_id,
-            state_code=result.state_code,
-            state_name=result.state_name,
-            availability=result.availability,
-            confidence=result.confidence,
-            similar_names=result.similar_names,
-            flags=flags + result.flags,
-            raw_matches=[m if isinstance(m, dict) else m.__dict__ for m in result.raw_matches],
-            notes=result.notes,
-        )
-        db.add(state_result)
-        await db.commit()
+    return StateResult(
+        job_id=job_id,
+        state_code=result.state_code,
+        state_name=result.state_name,
+        availability=result.availability,
+        confidence=result.confidence,
+        similar_names=result.similar_names,
+        flags=flags + result.flags,
+        raw_matches=result.raw_matches,
+        notes=result.notes,
+    )
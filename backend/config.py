@@ -1,3 +1,5 @@
+from functools import cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,8 +8,16 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./clearpath.db"
     frontend_url: str = "http://localhost:3000"
     ca_sos_api_key: str = ""
+    llm_concurrency: int = 8  # Anthropic requests in flight at once, process-wide
+    worker_count: int = 4     # search jobs run at once, process-wide
 
     model_config = {"env_file": "../.env"}
 
 
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    """The process-wide Settings; env / .env parsing runs once."""
+    return Settings()
+
+
+settings = get_settings()
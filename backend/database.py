@@ -1,15 +1,64 @@
+from dataclasses import fields, is_dataclass
+from functools import cache
+
+import orjson
+from sqlalchemy import LargeBinary, MetaData, Table, event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from config import settings
 
 _is_postgres = settings.database_url.startswith("postgresql")
+
+# Applied to every new SQLite connection. WAL lets the SSE pollers read while a
+# job is writing its results; with WAL, synchronous=NORMAL only fsyncs at
+# checkpoints (still crash-safe) instead of on every commit.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",     # wait up to 5s for a competing writer instead of failing
+    "cache_size=-64000",     # 64 MB page cache
+    "temp_store=MEMORY",
+    "mmap_size=268435456",   # 256 MB
+)
+
+
+@cache
+def _persisted_fields(cls) -> tuple[str, ...]:
+    # Derived (init=False) fields such as EntityMatch.name_key are not stored
+    return tuple(f.name for f in fields(cls) if f.init)
+
+
+def _json_default(obj):
+    if is_dataclass(obj):
+        return {name: getattr(obj, name) for name in _persisted_fields(type(obj))}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def json_serializer(obj) -> str:
+    # Adapters hand EntityMatch rows straight to JSON columns
+    # (StateResult.raw_matches); they are flattened here, once, at write time.
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode()
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads,
     pool_pre_ping=_is_postgres,
     connect_args={"statement_cache_size": 0} if _is_postgres else {},
 )
+
+if settings.database_url.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_on_connect(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -22,6 +71,59 @@ async def get_db():
         yield session
 
 
+# Tables whose id / job_id columns moved from 36-char strings to 16-byte blobs
+UUID_BLOB_TABLES = ("jobs", "state_results", "uspto_results")
+
+# Single-column job_id indexes superseded by the (job_id, checked_at) ones
+SUPERSEDED_INDEXES = ("ix_state_results_job_id", "ix_uspto_results_job_id")
+
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_schema)
+
+
+def _create_schema(sync_conn) -> None:
+    # Databases created before ids became UuidBlob keep string ids; convert
+    # those tables in place (same transaction) rather than fail on first read
+    legacy_rows = _drop_legacy_uuid_tables(sync_conn)
+    Base.metadata.create_all(sync_conn)
+    for name, rows in legacy_rows.items():
+        if rows:
+            # UuidBlob binds the legacy string ids as 16-byte values
+            sync_conn.execute(Base.metadata.tables[name].insert(), rows)
+        print(f"[db] converted {name} ids to 16-byte UUIDs ({len(rows)} rows)")
+    _sync_indexes(sync_conn)
+
+
+def _sync_indexes(sync_conn) -> None:
+    """create_all skips existing tables, so their model indexes are added here."""
+    for name in SUPERSEDED_INDEXES:
+        sync_conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            columns = ", ".join(col.name for col in index.columns)
+            sync_conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS {index.name} ON {table.name} ({columns})"
+            )
+
+
+def _drop_legacy_uuid_tables(sync_conn) -> dict[str, list[dict]]:
+    """Read and drop tables whose id column isn't binary yet; returns their rows."""
+    inspector = inspect(sync_conn)
+    existing = set(inspector.get_table_names())
+    legacy_rows: dict[str, list[dict]] = {}
+    for name in UUID_BLOB_TABLES:
+        if name not in existing:
+            continue
+        id_type = next(col["type"] for col in inspector.get_columns(name) if col["name"] == "id")
+        if isinstance(id_type, LargeBinary):
+            continue
+        table = Table(name, MetaData(), autoload_with=sync_conn)
+        columns = set(Base.metadata.tables[name].columns.keys())
+        legacy_rows[name] = [
+            {key: value for key, value in row.items() if key in columns}
+            for row in sync_conn.execute(select(table)).mappings()
+        ]
+        table.drop(sync_conn)
+    return legacy_rows
@@ -3,19 +3,146 @@ LLM client wrapper.
 - Haiku 4.5  → used for fallback page interpretation (cheap, fast)
 - Sonnet 4.6 → used for deceptive similarity analysis (more capable)
 """
-import json
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any
 
 import anthropic
+import httpx
+import json5
+import orjson
+from sqlalchemy.exc import IntegrityError
 
 from config import settings
+from database import AsyncSessionLocal
+from models import LlmCache
+
+# Keep-alive pool shared by every LLM call, so TLS handshakes amortize across calls
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=64, keepalive_expiry=60)
+HTTP_TIMEOUT = 60.0
+
+_async_client = anthropic.AsyncAnthropic(
+    api_key=settings.anthropic_api_key,
+    http_client=httpx.AsyncClient(limits=_HTTP_LIMITS, http2=True, timeout=HTTP_TIMEOUT),
+)
+
+
+# Caps Anthropic requests in flight across all jobs, so a burst of jobs
+# queues here instead of piling into rate limits
+LLM_CONCURRENCY = settings.llm_concurrency
+_llm_sem = asyncio.Semaphore(LLM_CONCURRENCY)
+
+
+async def _create_message(**kwargs):
+    async with _llm_sem:
+        return await _async_client.messages.create(**kwargs)
+
+
+async def close_client() -> None:
+    """Close the LLM connection pool (called on app shutdown)."""
+    await _async_client.close()
 
-_async_client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-_sync_client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
 
 HAIKU = "claude-haiku-4-5-20251001"
 SONNET = "claude-sonnet-4-6"
 
 
+# Page interpretations arriving within BATCH_WINDOW seconds of each other
+# (e.g. several states falling back at once) share one Haiku request
+BATCH_WINDOW = 0.025
+BATCH_MAX_PAGES = 8
+MAX_TOKENS_PER_PAGE = 300
+MAX_BATCH_TOKENS = 2400
+
+# Page text sent to Haiku: lines mentioning the searched name (or its most
+# distinctive word), plus this many lines either side, capped at PAGE_TEXT_CAP
+# characters
+PAGE_CONTEXT_LINES = 2
+PAGE_TEXT_CAP = 3000
+
+# Words too common in entity names to locate the searched one on a page
+NAME_STOP_WORDS = frozenset({
+    "a", "an", "and", "the", "of", "for", "at", "in", "on", "by", "to", "&",
+    "first", "american", "national", "united", "international", "global",
+    "new", "general", "north", "south", "east", "west", "central",
+    "inc", "inc.", "llc", "l.l.c.", "llp", "lp", "ltd", "ltd.", "corp", "corp.",
+    "corporation", "co", "co.", "company", "companies", "group", "holdings",
+    "partners", "services", "trust", "enterprises", "associates",
+})
+
+
+# ---------------------------------------------------------------------------
+# Prompt templates — built once at import, filled with str.format per call
+# ---------------------------------------------------------------------------
+
+_PAGE_FIELDS = """- availability: "available" | "taken" | "similar" | "unknown"
+- similar_names: list of entity names that appear similar to the searched name (may be empty)
+- clarity: "clear" | "inferred" | "ambiguous"
+- notes: one sentence explaining your conclusion"""
+
+_INTERPRET_TMPL = """You are analyzing the text of a U.S. state Secretary of State entity search results page.
+
+State: {state_name}
+Searched for: "{search_name}" ({entity_type})
+
+Page text (truncated):
+---
+{page_text}
+---
+
+Return a JSON object with these fields:
+""" + _PAGE_FIELDS + """
+
+Return only valid JSON, no other text."""
+
+_BATCH_PAGE_TMPL = """Page {index}
+State: {state_name}
+Searched for: "{search_name}" ({entity_type})
+Page text (truncated):
+---
+{page_text}
+---"""
+
+_BATCH_TMPL = """You are analyzing the text of {count} U.S. state Secretary of State entity search results pages.
+
+{pages}
+
+For each page, in page order, produce a JSON object with these fields:
+""" + _PAGE_FIELDS + """
+
+Return only valid JSON of the form {{"results": [...]}} with exactly one object per page, no other text."""
+
+_SIMILARITY_TMPL = """You are a business name availability specialist assessing deceptive similarity risk.
+
+Searched name: "{search_name}" ({entity_type})
+State: {state_name}
+State naming rules summary:
+{state_rules_summary}
+
+Similar names already registered in this state:
+{similar_names}
+
+Assess whether "{search_name}" would likely be rejected due to deceptive similarity to any of the above names.
+
+Return a JSON object with:
+- risk_level: "low" | "medium" | "high"
+- conflicting_names: list of the specific names that pose the greatest conflict
+- explanation: 2-3 sentences explaining the risk assessment
+- recommendation: one actionable sentence for the user
+
+Return only valid JSON, no other text."""
+
+
+@dataclass(slots=True)
+class PageRequest:
+    state_name: str
+    search_name: str
+    entity_type: str
+    page_text: str
+
+
 async def interpret_state_page(
     state_name: str,
     search_name: str,
@@ -25,81 +152,178 @@ async def interpret_state_page(
     """
     Haiku call: parse an ambiguous state results page.
     Returns structured JSON with availability, similar_names, clarity, notes.
+    Only the part of page_text around the searched name is sent (see
+    _narrow_page). Answers are cached by input; misses go through the
+    micro-batcher, so concurrent calls share one request.
     """
-    prompt = f"""You are analyzing the text of a U.S. state Secretary of State entity search results page.
+    page_text = _narrow_page(page_text, search_name)
+    key = _cache_key(HAIKU, "page", state_name, search_name, entity_type, page_text)
+    cached = await _cache_get(key)
+    if cached is not None:
+        return cached
+    result = await _batcher.submit(PageRequest(state_name, search_name, entity_type, page_text))
+    if result is None:
+        return _unparsed_page()
+    await _cache_put(key, result)
+    return result
 
-State: {state_name}
-Searched for: "{search_name}" ({entity_type})
 
-Page text (truncated):
----
-{page_text}
----
+async def _interpret_batch(pages: list[PageRequest]) -> list[dict | None]:
+    """
+    Interpret several results pages in one Haiku request. Results align with
+    pages, with None for pages whose answer couldn't be parsed.
+    """
+    if len(pages) == 1:
+        return [await _interpret_one(pages[0])]
 
-Return a JSON object with these fields:
-- availability: "available" | "taken" | "similar" | "unknown"
-- similar_names: list of entity names that appear similar to the searched name (may be empty)
-- clarity: "clear" | "inferred" | "ambiguous"
-- notes: one sentence explaining your conclusion
+    blocks = "\n\n".join(
+        _BATCH_PAGE_TMPL.format(
+            index=i,
+            state_name=page.state_name,
+            search_name=page.search_name,
+            entity_type=page.entity_type,
+            page_text=page.page_text,
+        )
+        for i, page in enumerate(pages)
+    )
+    prompt = _BATCH_TMPL.format(count=len(pages), pages=blocks)
 
-Return only valid JSON, no other text."""
+    response = await _create_message(
+        model=HAIKU,
+        max_tokens=min(MAX_TOKENS_PER_PAGE * len(pages), MAX_BATCH_TOKENS),
+        messages=[{"role": "user", "content": prompt}],
+    )
+
+    try:
+        results = _loads(response.content[0].text)["results"]
+    except (ValueError, IndexError, KeyError, TypeError):
+        results = None
+    if not isinstance(results, list) or len(results) != len(pages):
+        return [None] * len(pages)
+    return [r if isinstance(r, dict) else None for r in results]
 
-    response = await _async_client.messages.create(
+
+async def _interpret_one(page: PageRequest) -> dict | None:
+    prompt = _INTERPRET_TMPL.format(
+        state_name=page.state_name,
+        search_name=page.search_name,
+        entity_type=page.entity_type,
+        page_text=page.page_text,
+    )
+
+    response = await _create_message(
         model=HAIKU,
-        max_tokens=300,
+        max_tokens=MAX_TOKENS_PER_PAGE,
         messages=[{"role": "user", "content": prompt}],
     )
 
     try:
-        return json.loads(response.content[0].text)
-    except (json.JSONDecodeError, IndexError, KeyError):
-        return {
-            "availability": "unknown",
-            "similar_names": [],
-            "clarity": "ambiguous",
-            "notes": "LLM response could not be parsed.",
-        }
+        return _loads(response.content[0].text)
+    except (ValueError, IndexError, KeyError):
+        return None
 
 
-def interpret_state_page_sync(
-    state_name: str,
+def _narrow_page(
+    text: str,
     search_name: str,
-    entity_type: str,
-    page_text: str,
-) -> dict:
-    """Sync version for use inside ThreadPoolExecutor (no event loop available)."""
-    prompt = f"""You are analyzing the text of a U.S. state Secretary of State entity search results page.
+    radius: int = PAGE_CONTEXT_LINES,
+    cap: int = PAGE_TEXT_CAP,
+) -> str:
+    """
+    Lines of text that mention the rarest significant word of search_name
+    (case-insensitive, skipping NAME_STOP_WORDS), each with radius lines of
+    context either side, in page order and without repeats, cut to cap
+    characters. Matching one distinctive word keeps similar names ("Acme
+    Holdings LLC" for "Acme LLC") in view without matching every line that
+    starts with "The" or "First"; names made only of stop words match on the
+    whole name instead. Pages that mention neither are just cut to cap, so a
+    no-results message is still seen.
+    """
+    lines = text.split("\n")
+    folded = [line.casefold() for line in lines]
+    hits = _name_hits(folded, " ".join(search_name.casefold().split()))
+    if not hits:
+        return text[:cap]
+    keep = [False] * len(lines)
+    for i in hits:
+        for j in range(max(0, i - radius), min(len(lines), i + radius + 1)):
+            keep[j] = True
+    return "\n".join(line for line, kept in zip(lines, keep) if kept)[:cap]
 
-State: {state_name}
-Searched for: "{search_name}" ({entity_type})
 
-Page text (truncated):
----
-{page_text}
----
+def _name_hits(folded_lines: list[str], name: str) -> list[int]:
+    """Indexes of the lines mentioning name's rarest significant word, else name."""
+    if not name:
+        return []
+    candidates = []
+    for word in set(name.split()):
+        if len(word) < 3 or word in NAME_STOP_WORDS:
+            continue
+        word_hits = [i for i, line in enumerate(folded_lines) if word in line]
+        if word_hits:
+            candidates.append((len(word_hits), -len(word), word_hits))
+    if candidates:
+        return min(candidates)[2]
+    return [i for i, line in enumerate(folded_lines) if name in line]
 
-Return a JSON object with these fields:
-- availability: "available" | "taken" | "similar" | "unknown"
-- similar_names: list of entity names that appear similar to the searched name (may be empty)
-- clarity: "clear" | "inferred" | "ambiguous"
-- notes: one sentence explaining your conclusion
 
-Return only valid JSON, no other text."""
+def _unparsed_page() -> dict:
+    return {
+        "availability": "unknown",
+        "similar_names": [],
+        "clarity": "ambiguous",
+        "notes": "LLM response could not be parsed.",
+    }
 
-    try:
-        response = _sync_client.messages.create(
-            model=HAIKU,
-            max_tokens=300,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return json.loads(response.content[0].text)
-    except Exception:
-        return {
-            "availability": "unknown",
-            "similar_names": [],
-            "clarity": "ambiguous",
-            "notes": "LLM response could not be parsed.",
-        }
+
+class _PageBatcher:
+    """
+    Collects interpret_state_page calls for up to BATCH_WINDOW seconds (or
+    BATCH_MAX_PAGES pages), sends them as one _interpret_batch request
+    and hands each caller its own result.
+    """
+
+    def __init__(self):
+        self._pending: list[tuple[PageRequest, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def submit(self, page: PageRequest) -> dict | None:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((page, fut))
+        if len(self._pending) >= BATCH_MAX_PAGES:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(BATCH_WINDOW, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # Callers that gave up while waiting are dropped from the request
+        batch = [(page, fut) for page, fut in batch if not fut.done()]
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch: list[tuple[PageRequest, asyncio.Future]]) -> None:
+        try:
+            results = await _interpret_batch([page for page, _ in batch])
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+_batcher = _PageBatcher()
 
 
 async def analyze_similarity(
@@ -113,38 +337,87 @@ async def analyze_similarity(
     Sonnet call: assess deceptive similarity risk between searched name and found names.
     Only called when similar names are present.
     """
-    prompt = f"""You are a business name availability specialist assessing deceptive similarity risk.
-
-Searched name: "{search_name}" ({entity_type})
-State: {state_name}
-State naming rules summary:
-{state_rules_summary}
-
-Similar names already registered in this state:
-{json.dumps(similar_names, indent=2)}
-
-Assess whether "{search_name}" would likely be rejected due to deceptive similarity to any of the above names.
-
-Return a JSON object with:
-- risk_level: "low" | "medium" | "high"
-- conflicting_names: list of the specific names that pose the greatest conflict
-- explanation: 2-3 sentences explaining the risk assessment
-- recommendation: one actionable sentence for the user
+    prompt = _SIMILARITY_TMPL.format(
+        search_name=search_name,
+        entity_type=entity_type,
+        state_name=state_name,
+        state_rules_summary=state_rules_summary,
+        similar_names=orjson.dumps(similar_names, option=orjson.OPT_INDENT_2).decode(),
+    )
 
-Return only valid JSON, no other text."""
+    key = _cache_key(SONNET, "similarity", prompt)
+    cached = await _cache_get(key)
+    if cached is not None:
+        return cached
 
-    response = await _async_client.messages.create(
+    response = await _create_message(
         model=SONNET,
         max_tokens=400,
         messages=[{"role": "user", "content": prompt}],
     )
 
     try:
-        return json.loads(response.content[0].text)
-    except (json.JSONDecodeError, IndexError, KeyError):
+        result = _loads(response.content[0].text)
+    except (ValueError, IndexError, KeyError):
         return {
             "risk_level": "unknown",
             "conflicting_names": similar_names,
             "explanation": "Could not parse similarity analysis.",
             "recommendation": "Review similar names manually.",
         }
+    await _cache_put(key, result)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Response parsing
+# ---------------------------------------------------------------------------
+
+# Markdown code fence around the whole reply (```json ... ```)
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def _loads(text: str) -> Any:
+    """
+    Parse a model reply as JSON. orjson first; only when that fails, strip a
+    code fence and retry, then fall back to json5 for trailing commas, single
+    quotes and the like. Raises ValueError if nothing parses.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+    text = _FENCE_RE.sub("", text)
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json5.loads(text)
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+def _cache_key(model: str, kind: str, *parts: str) -> str:
+    return hashlib.sha256(orjson.dumps([model, kind, *parts])).hexdigest()
+
+
+async def _cache_get(key: str) -> dict | None:
+    try:
+        async with AsyncSessionLocal() as db:
+            row = await db.get(LlmCache, key)
+    except Exception as exc:
+        print(f"[llm cache] lookup failed: {type(exc).__name__}: {exc}")
+        return None
+    return row.response if row is not None else None
+
+
+async def _cache_put(key: str, response: dict) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            db.add(LlmCache(key=key, response=response))
+            await db.commit()
+    except IntegrityError:
+        pass  # a concurrent call stored the same answer first
+    except Exception as exc:
+        print(f"[llm cache] store failed: {type(exc).__name__}: {exc}")
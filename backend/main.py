@@ -1,32 +1,63 @@
 import asyncio
-import json
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
 
+from adapters._browser import close_browser, warm_browser
+from adapters._http import close_client
 from adapters.detail.opencorporates import fetch_entity_detail
+from adapters.states.de import shutdown as shutdown_delaware_browsers
+from adapters.states.de import warmup as warm_delaware_browsers
+from adapters.states.fl import close_client as close_florida_client
+from adapters.states.nj import close_client as close_new_jersey_client
+from agents.events import publish, subscribe, unsubscribe
 from agents.orchestrator import run_search
 from config import settings
-from database import AsyncSessionLocal, get_db, init_db
+from database import AsyncSessionLocal, get_db, init_db, json_serializer
+from llm.client import close_client as close_llm_client
 from models import EntityDetailCache, Job, StateResult, UsptoResult
 
-# In-memory set of active job IDs being streamed
-_active_jobs: dict[str, asyncio.Event] = {}
+# Streams normally wake on published events; polling the database is only a
+# fallback, e.g. for a job whose run died with the previous process
+STREAM_FALLBACK_POLL = 15.0
+
+# Jobs waiting for one of settings.worker_count workers; new searches are
+# refused with 503 while it is full
+JOB_QUEUE_SIZE = 256
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    warm_delaware_browsers()
+    browser_warmup = asyncio.create_task(warm_browser())
+    app.state.job_queue = asyncio.Queue(maxsize=JOB_QUEUE_SIZE)
+    workers = [asyncio.create_task(_job_worker(app.state.job_queue)) for _ in range(settings.worker_count)]
+    await _requeue_pending_jobs(app.state.job_queue)
     yield
-
-
-app = FastAPI(title="Clear Path Entity", lifespan=lifespan)
+    # Finish queued and in-flight jobs before the clients they use go away
+    await app.state.job_queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await browser_warmup
+    await close_client()
+    await close_florida_client()
+    await close_new_jersey_client()
+    await close_llm_client()
+    await close_browser()
+    await asyncio.to_thread(shutdown_delaware_browsers)
+
+
+app = FastAPI(title="Clear Path Entity", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -54,7 +85,6 @@ class SearchResponse(BaseModel):
 @app.post("/api/search", response_model=SearchResponse)
 async def create_search(
     req: SearchRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     name = req.name.strip()
@@ -68,25 +98,46 @@ async def create_search(
     if not states:
         raise HTTPException(400, f"No supported states requested. Supported: {SUPPORTED_STATES}")
 
+    job_queue: asyncio.Queue = app.state.job_queue
+    if job_queue.full():
+        raise HTTPException(503, "Too many searches queued; try again shortly.")
+
     job = Job(name=name, entity_type=req.entity_type, states=states, status="pending")
     db.add(job)
     await db.commit()
     await db.refresh(job)
 
-    done_event = asyncio.Event()
-    _active_jobs[job.id] = done_event
-
-    background_tasks.add_task(_run_and_signal, job.id, name, req.entity_type, states, done_event)
+    await job_queue.put((job.id, name, req.entity_type, states))
 
     return SearchResponse(job_id=job.id, states_queued=states)
 
 
+async def _job_worker(queue: asyncio.Queue) -> None:
+    while True:
+        job_id, name, entity_type, states = await queue.get()
+        try:
+            await _run_and_signal(job_id, name, entity_type, states)
+        except Exception as exc:
+            print(f"[job {job_id}] worker error: {type(exc).__name__}: {exc}")
+        finally:
+            queue.task_done()
+
+
+async def _requeue_pending_jobs(queue: asyncio.Queue) -> None:
+    """Queue jobs accepted by a previous process that never started running."""
+    async with AsyncSessionLocal() as db:
+        jobs = (await db.scalars(
+            select(Job).where(Job.status == "pending").order_by(Job.created_at).limit(JOB_QUEUE_SIZE)
+        )).all()
+    for job in jobs:
+        queue.put_nowait((job.id, job.name, job.entity_type, job.states))
+
+
 async def _run_and_signal(
     job_id: str,
     name: str,
     entity_type: str,
     states: list[str],
-    done_event: asyncio.Event,
 ):
     async with AsyncSessionLocal() as db:
         job = await db.get(Job, job_id)
@@ -95,108 +146,144 @@ async def _run_and_signal(
 
     try:
         await run_search(job_id, name, entity_type, states)
+        status = "complete"
     except Exception as exc:
-        async with AsyncSessionLocal() as db:
-            job = await db.get(Job, job_id)
-            job.status = "error"
-            job.completed_at = datetime.now(timezone.utc)
-            await db.commit()
         print(f"[job {job_id}] error: {exc}")
-        return
-    finally:
-        done_event.set()
-        _active_jobs.pop(job_id, None)
+        status = "error"
 
     async with AsyncSessionLocal() as db:
         job = await db.get(Job, job_id)
-        job.status = "complete"
+        job.status = status
         job.completed_at = datetime.now(timezone.utc)
         await db.commit()
+    publish(job_id, "done", status)
+
+
+def _json(obj) -> str:
+    # Same encoder as the JSON columns, so a live frame built from in-memory
+    # EntityMatch rows is byte-identical to its replay from the database
+    return json_serializer(obj)
+
+
+# Client-facing fields per event type, in payload order
+_PAYLOAD_COLUMNS = {
+    "state_result": (
+        StateResult.state_code,
+        StateResult.state_name,
+        StateResult.availability,
+        StateResult.confidence,
+        StateResult.similar_names,
+        StateResult.flags,
+        StateResult.raw_matches,
+        StateResult.notes,
+    ),
+    "uspto_result": (
+        UsptoResult.exact_matches,
+        UsptoResult.similar_marks,
+        UsptoResult.risk_level,
+        UsptoResult.notes,
+    ),
+}
+
+
+def _row_payload(event: str, row) -> dict:
+    """Payload of a freshly published ORM row."""
+    return {col.key: getattr(row, col.key) for col in _PAYLOAD_COLUMNS[event]}
+
+
+# (event, row id, checked_at, payload)
+_StreamRow = tuple[str, str, datetime, dict]
+
+
+async def _poll_job(job_id: str, watermark: datetime | None) -> tuple[str | None, list[_StreamRow]]:
+    """
+    Job status (None if the job doesn't exist) and its persisted result rows,
+    state results limited to checked_at >= watermark. Status is read first, so
+    a finished job's rows are all included. Rows are read as plain column
+    mappings, without building ORM objects.
+    """
+    async with AsyncSessionLocal() as db:
+        status = await db.scalar(select(Job.status).where(Job.id == job_id))
+        if status is None:
+            return None, []
+        query = (
+            select(StateResult.id, StateResult.checked_at, *_PAYLOAD_COLUMNS["state_result"])
+            .where(StateResult.job_id == job_id)
+        )
+        if watermark is not None:
+            query = query.where(StateResult.checked_at >= watermark)
+        rows: list[_StreamRow] = []
+        for m in (await db.execute(query.order_by(StateResult.checked_at))).mappings():
+            payload = dict(m)
+            rows.append(("state_result", payload.pop("id"), payload.pop("checked_at"), payload))
+        m = (await db.execute(
+            select(UsptoResult.id, UsptoResult.checked_at, *_PAYLOAD_COLUMNS["uspto_result"])
+            .where(UsptoResult.job_id == job_id)
+        )).mappings().first()
+        if m is not None:
+            payload = dict(m)
+            rows.append(("uspto_result", payload.pop("id"), payload.pop("checked_at"), payload))
+        return status, rows
 
 
 @app.get("/api/jobs/{job_id}/stream")
-async def stream_results(job_id: str):
+async def stream_results(job_id: UUID):
     """SSE endpoint — streams state results as they complete."""
+    job_id = str(job_id)
 
     async def event_generator():
-        sent_result_ids: set[str] = set()
-        done_event = _active_jobs.get(job_id)
-
-        while True:
-            async with AsyncSessionLocal() as db:
-                # Fetch job status
-                job = await db.get(Job, job_id)
-                if job is None:
-                    yield {"event": "error", "data": json.dumps({"message": "Job not found"})}
-                    return
-
-                # Fetch any new state results
-                result = await db.execute(
-                    select(StateResult).where(StateResult.job_id == job_id)
-                )
-                state_results = result.scalars().all()
-
-                for sr in state_results:
-                    if sr.id not in sent_result_ids:
-                        sent_result_ids.add(sr.id)
-                        yield {
-                            "event": "state_result",
-                            "data": json.dumps({
-                                "state_code": sr.state_code,
-                                "state_name": sr.state_name,
-                                "availability": sr.availability,
-                                "confidence": sr.confidence,
-                                "similar_names": sr.similar_names,
-                                "flags": sr.flags,
-                                "raw_matches": sr.raw_matches,
-                                "notes": sr.notes,
-                            }),
-                        }
-
-                # Fetch USPTO result if available
-                uspto_result = await db.execute(
-                    select(UsptoResult).where(UsptoResult.job_id == job_id)
-                )
-                uspto = uspto_result.scalar_one_or_none()
-                if uspto and f"uspto_{uspto.id}" not in sent_result_ids:
-                    sent_result_ids.add(f"uspto_{uspto.id}")
-                    yield {
-                        "event": "uspto_result",
-                        "data": json.dumps({
-                            "exact_matches": uspto.exact_matches,
-                            "similar_marks": uspto.similar_marks,
-                            "risk_level": uspto.risk_level,
-                            "notes": uspto.notes,
-                        }),
-                    }
-
-                if job.status in ("complete", "error"):
-                    yield {"event": "done", "data": json.dumps({"status": job.status})}
+        queue = subscribe(job_id)
+        try:
+            # Catch up on whatever was persisted before we subscribed; from
+            # then on the run's published events drive the stream
+            sent_ids: set[str] = set()
+            status, rows = await _poll_job(job_id, None)
+            if status is None:
+                yield {"event": "error", "data": _json({"message": "Job not found"})}
+                return
+            watermark = None
+            while True:
+                for event, row_id, checked_at, payload in rows:
+                    if row_id in sent_ids:
+                        continue  # already delivered by the other path
+                    sent_ids.add(row_id)
+                    if event == "state_result":
+                        watermark = checked_at
+                    yield {"event": event, "data": _json(payload)}
+
+                if status in ("complete", "error"):
+                    yield {"event": "done", "data": _json({"status": status})}
                     return
 
-            # Wait a bit before polling again; wake early if job signals done
-            if done_event:
                 try:
-                    await asyncio.wait_for(asyncio.shield(done_event.wait()), timeout=1.0)
+                    event, payload = await asyncio.wait_for(queue.get(), timeout=STREAM_FALLBACK_POLL)
                 except asyncio.TimeoutError:
-                    pass
-            else:
-                await asyncio.sleep(1.0)
+                    status, rows = await _poll_job(job_id, watermark)
+                    continue
+                if event == "done":
+                    rows, status = [], payload
+                else:
+                    rows = [(event, payload.id, payload.checked_at, _row_payload(event, payload))]
+        finally:
+            unsubscribe(job_id, queue)
 
     return EventSourceResponse(event_generator())
 
 
 @app.get("/api/jobs/{job_id}")
-async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+async def get_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
+    job_id = str(job_id)
     job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(404, "Job not found")
 
     state_results = await db.execute(
-        select(StateResult).where(StateResult.job_id == job_id)
+        select(*_PAYLOAD_COLUMNS["state_result"])
+        .where(StateResult.job_id == job_id)
+        .order_by(StateResult.checked_at)
     )
     uspto_result = await db.execute(
-        select(UsptoResult).where(UsptoResult.job_id == job_id)
+        select(*_PAYLOAD_COLUMNS["uspto_result"]).where(UsptoResult.job_id == job_id)
     )
 
     return {
@@ -205,42 +292,57 @@ async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
         "entity_type": job.entity_type,
         "status": job.status,
         "created_at": job.created_at.isoformat(),
-        "state_results": [
-            {
-                "state_code": r.state_code,
-                "state_name": r.state_name,
-                "availability": r.availability,
-                "confidence": r.confidence,
-                "similar_names": r.similar_names,
-                "flags": r.flags,
-                "raw_matches": r.raw_matches,
-                "notes": r.notes,
-            }
-            for r in state_results.scalars().all()
-        ],
-        "uspto_result": (
-            {
-                "exact_matches": _u.exact_matches,
-                "similar_marks": _u.similar_marks,
-                "risk_level": _u.risk_level,
-                "notes": _u.notes,
-            }
-            if (_u := uspto_result.scalar_one_or_none()) is not None
-            else None
-        ),
+        "state_results": [dict(m) for m in state_results.mappings()],
+        "uspto_result": dict(_u) if (_u := uspto_result.mappings().first()) is not None else None,
     }
 
 
+# Cached entity details never change once stored
+ENTITY_CACHE_CONTROL = "private, max-age=3600"
+
+
+def _entity_etag(row: EntityDetailCache) -> str:
+    fetched_at = row.fetched_at
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)  # SQLite drops the offset; stored as UTC
+    # Weak: the cached and freshly-fetched bodies differ only in the "cached" flag
+    return f'W/"{row.file_number}-{int(fetched_at.timestamp())}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check: a comma-separated list or "*", compared weakly (RFC 9110)."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
 @app.get("/api/entity/{state_code}/{file_number}")
-async def get_entity_detail(state_code: str, file_number: str, db: AsyncSession = Depends(get_db)):
+async def get_entity_detail(
+    state_code: str,
+    file_number: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     """
     Return detail for a single entity by state code and file number.
     Checks the cache first; fetches live from OpenCorporates if not cached.
+    Stored details carry an ETag; a matching If-None-Match gets a bare 304.
     """
     state_code = state_code.upper()
     cache_key = f"{state_code}:{file_number}"
     cached = await db.get(EntityDetailCache, cache_key)
     if cached:
+        etag = _entity_etag(cached)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": ENTITY_CACHE_CONTROL})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = ENTITY_CACHE_CONTROL
         oc_url = f"https://opencorporates.com/companies/us_{state_code.lower()}/{file_number}"
         return {
             "file_number": cached.file_number,
@@ -265,6 +367,8 @@ async def get_entity_detail(state_code: str, file_number: str, db: AsyncSession
         )
         db.add(cache_row)
         await db.commit()
+        response.headers["ETag"] = _entity_etag(cache_row)
+        response.headers["Cache-Control"] = ENTITY_CACHE_CONTROL
 
     return {
         "file_number": file_number,
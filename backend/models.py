@@ -1,8 +1,11 @@
+import os
+import time
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, DateTime, Float, String, Text
+from sqlalchemy import JSON, DateTime, Float, Index, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
 
 from database import Base
 
@@ -11,10 +14,36 @@ def utcnow():
     return datetime.now(timezone.utc)
 
 
+def new_id() -> str:
+    """
+    Time-ordered UUID (version 7 layout: 48-bit millisecond timestamp, then
+    random bits). New rows land at the right edge of the primary-key B-tree
+    instead of at random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+class UuidBlob(TypeDecorator):
+    """UUID stored as 16 raw bytes instead of a 36-char string; str on the Python side."""
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else uuid.UUID(value).bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value  # legacy row still holding the 36-char string form
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
 class Job(Base):
     __tablename__ = "jobs"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UuidBlob, primary_key=True, default=new_id)
     name: Mapped[str] = mapped_column(String, nullable=False)
     entity_type: Mapped[str] = mapped_column(String, nullable=False)
     states: Mapped[list] = mapped_column(JSON, nullable=False)
@@ -25,9 +54,11 @@ class Job(Base):
 
 class StateResult(Base):
     __tablename__ = "state_results"
+    # Serves per-job lookups in result order (SSE watermark, job fetch)
+    __table_args__ = (Index("ix_state_results_job_checked", "job_id", "checked_at"),)
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    job_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    id: Mapped[str] = mapped_column(UuidBlob, primary_key=True, default=new_id)
+    job_id: Mapped[str] = mapped_column(UuidBlob, nullable=False)
     state_code: Mapped[str] = mapped_column(String(2), nullable=False)
     state_name: Mapped[str] = mapped_column(String, nullable=False)
     availability: Mapped[str] = mapped_column(String, nullable=False)  # available | taken | similar | unknown | error
@@ -41,9 +72,10 @@ class StateResult(Base):
 
 class UsptoResult(Base):
     __tablename__ = "uspto_results"
+    __table_args__ = (Index("ix_uspto_results_job_checked", "job_id", "checked_at"),)
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    job_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    id: Mapped[str] = mapped_column(UuidBlob, primary_key=True, default=new_id)
+    job_id: Mapped[str] = mapped_column(UuidBlob, nullable=False)
     exact_matches: Mapped[list] = mapped_column(JSON, default=list)
     similar_marks: Mapped[list] = mapped_column(JSON, default=list)
     risk_level: Mapped[str] = mapped_column(String, default="low")  # low | medium | high
@@ -62,3 +94,12 @@ class EntityDetailCache(Base):
     formation_date: Mapped[str | None] = mapped_column(String, nullable=True)
     registered_agent: Mapped[str | None] = mapped_column(String, nullable=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
+class LlmCache(Base):
+    """LLM responses keyed by a hash of the model + prompt inputs; only parsed responses are stored."""
+    __tablename__ = "llm_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 hex
+    response: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
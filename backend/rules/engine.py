@@ -5,9 +5,10 @@ Add new states by extending RULES below.
 """
 import re
 from dataclasses import dataclass
+from functools import cache, lru_cache
 
 
-@dataclass
+@dataclass(frozen=True)
 class NamingRule:
     pattern: str           # regex pattern (case-insensitive)
     message: str           # human-readable flag message
@@ -74,23 +75,46 @@ STATE_RULES_SUMMARIES: dict[str, str] = {
 }
 
 
-def apply_rules(name: str, entity_type: str, state_code: str) -> list[str]:
+def apply_rules(name: str, entity_type: str, state_code: str) -> tuple[str, ...]:
     """
     Run deterministic naming rules against the searched name.
-    Returns a list of flag messages (may be empty).
+    Returns a tuple of flag messages (may be empty); results are memoized, so
+    callers copy it before adding flags of their own.
     """
-    state_rules = RULES.get(state_code.upper(), [])
-    flags: list[str] = []
+    return _apply_rules(name.strip(), entity_type, state_code.upper())
 
-    for rule in state_rules:
-        # Skip rules that don't apply to this entity type
-        if rule.entity_types and entity_type not in rule.entity_types:
-            continue
-        if re.search(rule.pattern, name, re.IGNORECASE):
-            flags.append(f"[{rule.severity.upper()}] {rule.message}")
 
-    return flags
+@lru_cache(maxsize=4096)
+def _apply_rules(name: str, entity_type: str, state_code: str) -> tuple[str, ...]:
+    combined, compiled = _compiled_rules(state_code, entity_type)
+    # One scan of the union rejects the common case (no rule hits at all)
+    if combined is None or combined.search(name) is None:
+        return ()
+    return tuple(
+        f"[{rule.severity.upper()}] {rule.message}"
+        for pattern, rule in compiled
+        if pattern.search(name)
+    )
 
 
+@cache
+def _compiled_rules(
+    state_code: str, entity_type: str
+) -> tuple[re.Pattern | None, tuple[tuple[re.Pattern, NamingRule], ...]]:
+    """
+    Compiled rules that apply to (state, entity type), in RULES order, plus
+    their union as a single alternation (None when no rule applies).
+    """
+    applicable = [
+        rule for rule in RULES.get(state_code, [])
+        if not rule.entity_types or entity_type in rule.entity_types
+    ]
+    if not applicable:
+        return None, ()
+    combined = re.compile("|".join(f"(?:{rule.pattern})" for rule in applicable), re.IGNORECASE)
+    return combined, tuple((re.compile(rule.pattern, re.IGNORECASE), rule) for rule in applicable)
+
+
+@cache
 def get_rules_summary(state_code: str) -> str:
     return STATE_RULES_SUMMARIES.get(state_code.upper(), "No specific rules encoded for this state.")